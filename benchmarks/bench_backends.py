@@ -0,0 +1,68 @@
+""" Word store backend benchmark.
+
+Compare the build time, memory and queries of the word store backends
+with a plain set of words.
+
+Run from the repository root:
+    python -m benchmarks.bench_backends [descriptions] [queries]
+"""
+
+import sys
+import time
+import tracemalloc
+from random import Random
+
+from benchmarks.bench_word_filter import sample_descriptions
+from classes.word_dictionary import BACKENDS
+from classes.word_filter import filter_words
+
+
+def measure(build) -> tuple[object, float, int]:
+    """ Build an object, return it with the build time and memory. """
+
+    start = time.perf_counter()
+    built = build()
+    elapsed = time.perf_counter() - start
+    del built
+    tracemalloc.start()
+    built = build()
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return built, elapsed, memory
+
+
+def timed(queries: list, query) -> float:
+    """ Mean microseconds of a query. """
+
+    start = time.perf_counter()
+    for argument in queries:
+        query(argument)
+    return (time.perf_counter() - start) / len(queries) * 1e6
+
+
+def main(count: int = 200_000, queries: int = 20_000) -> None:
+    """ Print the build time, memory and query times of every backend. """
+
+    words = sorted(set(filter_words(sample_descriptions(count))))
+    rng = Random(0)
+    lookups = rng.choices(words, k=queries)
+    prefixes = [word[:rng.randint(1, len(word))] for word in lookups]
+
+    print(f"{len(words)} words, {queries} queries")
+    print(f"{'backend':>8} {'build s':>8} {'memory':>10} "
+          f"{'in µs':>7} {'prefix µs':>9}")
+    # New strings, so they are counted with the set
+    _, elapsed, memory = measure(
+        lambda: {word.encode().decode() for word in words})
+    print(f"{'set':>8} {elapsed:>8.3f} {memory:>10,}")
+    for name, backend in BACKENDS.items():
+        store, elapsed, memory = measure(lambda: backend(words))
+        contains = timed(lookups, store.__contains__)
+        prefix = timed(prefixes,
+                       lambda prefix: len(store.prefix_ids(prefix)))
+        print(f"{name:>8} {elapsed:>8.3f} {memory:>10,} "
+              f"{contains:>7.2f} {prefix:>9.2f}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,196 @@
+""" Word dictionary benchmark suite.
+
+Time the dictionary build and load, the computer moves of every level,
+adding and removing words and saving the changes on a generated DEX xml
+file, and compare the times with the stored baselines. Every case is
+run several times and the fastest run is kept.
+
+Run from the repository root:
+    python -m benchmarks.bench_dictionary [--entries N] [--save]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import timeit
+from random import Random, seed
+
+from benchmarks.dex_generator import write_dex_xml
+from classes.events import NullSink
+from classes.player import AiPlayer, EXPERT_AI_LEVEL
+from classes.opening_book import BOOK_SUFFIX
+from classes.word_dictionary import CACHE_SUFFIX, WordDictionary
+
+BASELINES_PATH: str = os.path.join(os.path.dirname(__file__),
+                                   "baselines.json")
+# A case is a regression if it is this many times slower than its baseline
+REGRESSION_FACTOR: float = 1.5
+ENTRIES: int = 100_000
+# Computer moves timed for every level
+MOVES: int = 500
+# Words added and removed
+CHANGED_WORDS: int = 1_000
+AI_LEVELS: tuple[float, ...] = (*range(1, 11), EXPERT_AI_LEVEL)
+# Runs of every case, the fastest one is kept
+REPEATS: int = 5
+
+
+def timed(function, setup=lambda: None) -> float:
+    """ Fastest seconds to run 'function' after 'setup'. """
+
+    return min(timeit.repeat(function, setup, number=1, repeat=REPEATS))
+
+
+def once(function) -> float:
+    """ Seconds to run 'function' once. """
+
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def remove_compiled(path: str) -> None:
+    """ Remove the compiled dictionary and opening book of 'path'. """
+
+    for suffix in (CACHE_SUFFIX, BOOK_SUFFIX):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+def bench_moves(dictionary: WordDictionary, level: float) -> float:
+    """ Mean seconds of a computer move from a random word end,
+    fastest of the runs.
+    """
+
+    return min(mean_move(dictionary, level, run) for run in range(REPEATS))
+
+
+def mean_move(dictionary: WordDictionary, level: float, run: int) -> float:
+    """ Mean seconds of a computer move from a random word end. """
+
+    rng = Random(run)
+    words = sorted(dictionary.words)
+    player = AiPlayer(f"level {level:g}", ai_level=level)
+    sink = NullSink()
+    total = 0.0
+    session = dictionary.new_session()
+    for _ in range(MOVES):
+        word_start = rng.choice(words)[-2:]
+        start = time.perf_counter()
+        word = player.play(word_start, session, sink=sink,
+                           interactive=False)
+        total += time.perf_counter() - start
+        if word != "remove_player":
+            session.discard_word(word)
+        if len(session.played_words) > len(words) // 2:
+            session = dictionary.new_session()
+    return total / MOVES
+
+
+def run_cases(entries: int) -> dict[str, float]:
+    """ Time every case, in seconds. """
+
+    results = {}
+    seed(0)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "dex.xml")
+        write_dex_xml(path, entries)
+        results["build"] = timed(lambda: WordDictionary(path),
+                                 lambda: remove_compiled(path))
+        results["load compiled"] = timed(lambda: WordDictionary(path))
+        dictionary = WordDictionary(path)
+        for level in AI_LEVELS:
+            results[f"move (level {level:g})"] = bench_moves(
+                dictionary, level)
+
+        for run in range(REPEATS):
+            # The changes are made on a copy of the compiled dictionary
+            changes = bench_changes(directory, sorted(dictionary.words))
+            for case, seconds in changes.items():
+                results[case] = min(results.get(case, seconds), seconds)
+    return results
+
+
+def bench_changes(directory: str, words: list[str]) -> dict[str, float]:
+    """ Seconds of the word changes on a copy of the 'dex.xml' file
+    in 'directory'.
+    """
+
+    results = {}
+    with tempfile.TemporaryDirectory() as copy:
+        copy = shutil.copytree(directory, os.path.join(copy, "dex"))
+        path = os.path.join(copy, "dex.xml")
+        dictionary = WordDictionary(path)
+        rng = Random(1)
+        added = [word + "zz" for word in rng.sample(words, CHANGED_WORDS)]
+        removed = rng.sample(words, CHANGED_WORDS)
+        results["add words"] = once(lambda: dictionary.add_words(*added))
+        results["remove words"] = once(
+            lambda: dictionary.remove_words(*removed))
+        results["save changes"] = once(dictionary.save_xml)
+        results["load with journal"] = once(lambda: WordDictionary(path))
+        # The journal words were compiled by the first load
+        results["reload with journal"] = once(lambda: WordDictionary(path))
+        results["compact xml"] = once(dictionary.compact_xml)
+    return results
+
+
+def compare(results: dict[str, float],
+            baselines: dict[str, float]
+            ) -> list[str]:
+    """ Print the results next to the baselines, return the regressions. """
+
+    regressions = []
+    print(f"\n{'case':<22} {'time':>12} {'baseline':>12} {'ratio':>6}")
+    for case, seconds in results.items():
+        baseline = baselines.get(case)
+        if baseline:
+            ratio = seconds / baseline
+            flag = " !" if ratio > REGRESSION_FACTOR else ""
+            if flag:
+                regressions.append(case)
+            print(f"{case:<22} {seconds:>12.6f} {baseline:>12.6f} "
+                  f"{ratio:>6.2f}{flag}")
+        else:
+            print(f"{case:<22} {seconds:>12.6f} {'-':>12}")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    """ Run the benchmarks, return 1 if a case regressed. """
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--entries", type=int, default=ENTRIES,
+                        help="xml entries to generate")
+    parser.add_argument("--save", action="store_true",
+                        help="save the results as the new baselines")
+    args = parser.parse_args(argv)
+
+    # Baselines are kept for every xml size
+    key = str(args.entries)
+    baselines = {}
+    if os.path.exists(BASELINES_PATH):
+        with open(BASELINES_PATH, encoding="utf-8") as file:
+            baselines = json.load(file)
+
+    results = run_cases(args.entries)
+    regressions = compare(results, baselines.get(key, {}))
+    if args.save:
+        baselines[key] = results
+        with open(BASELINES_PATH, "w", encoding="utf-8") as file:
+            json.dump(baselines, file, indent=4)
+        print(f"\nSaved the baselines for {key} entries")
+        return 0
+    if regressions:
+        print(f"\n{len(regressions)} case(s) slower than "
+              f"{REGRESSION_FACTOR}x baseline: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+""" Word filter throughput benchmark.
+
+Run from the repository root:
+    python -m benchmarks.bench_word_filter [descriptions] [batch size]
+"""
+
+import sys
+import time
+from random import Random
+
+from classes.word_filter import filter_descriptions
+
+LETTERS = "abcdefghijklmnopqrstuvwxyzăâîșț"
+
+
+def sample_descriptions(count: int, seed: int = 0) -> list[str]:
+    """ Random DEX-like descriptions. """
+
+    rng = Random(seed)
+    descriptions = []
+    for _ in range(count):
+        word = "".join(rng.choices(LETTERS, k=rng.randint(2, 12)))
+        roll = rng.random()
+        if roll < 0.1:
+            word = word.capitalize()
+        elif roll < 0.3:
+            word += " (s.f.)"
+        elif roll < 0.4:
+            word += " / " + word[:-1] + "ă"
+        descriptions.append(word)
+    return descriptions
+
+
+def main(count: int = 200_000, batch_size: int = 10_000) -> None:
+    """ Print the filtered descriptions per second. """
+
+    descriptions = sample_descriptions(count)
+    start = time.perf_counter()
+    words = 0
+    for index in range(0, count, batch_size):
+        batch = descriptions[index:index + batch_size]
+        words += sum(map(len, filter_descriptions(batch)))
+    elapsed = time.perf_counter() - start
+    print(f"{count} descriptions -> {words} words in {elapsed:.3f}s "
+          f"({count / elapsed:,.0f} descriptions/s)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,78 @@
+""" Synthetic DEX xml generator.
+
+Write a DEXOnline shaped xml file (Entry/Timestamp/Description) with
+romanian looking words, diacritics, '(...)' annotations, ' / ' variants
+and capitalized names.
+
+Run from the repository root:
+    python -m benchmarks.dex_generator <path> [entries] [seed]
+"""
+
+import sys
+from random import Random
+from xml.sax.saxutils import escape
+
+SYLLABLES = (
+    "ma", "re", "ca", "sa", "ta", "ri", "ne", "lo", "pe", "tu", "ba", "co",
+    "de", "fi", "ga", "la", "mi", "no", "pa", "ro", "se", "ti", "va", "zi",
+    "ar", "ul", "ea", "ie", "or", "in", "es", "at", "ăr", "âi", "în", "șa",
+    "ța", "că", "tă", "gi", "ce", "chi", "ghe", "str", "pl", "br",
+    )
+ANNOTATIONS = (" (s.f.)", " (s.m.)", " (adj.)", " (înv.)", " (pop.)",
+               " (reg.)", " (vb.)")
+# Share of the descriptions of every kind
+NAME_SHARE: float = 0.08
+ANNOTATION_SHARE: float = 0.25
+VARIANT_SHARE: float = 0.1
+SHORT_SHARE: float = 0.03
+# First entry timestamp
+TIMESTAMP: int = 1_100_000_000
+
+
+def generate_word(rng: Random) -> str:
+    """ A romanian looking word. """
+
+    return "".join(rng.choices(SYLLABLES, k=rng.choice((1, 2, 2, 3, 3, 4))))
+
+
+def generate_description(rng: Random) -> str:
+    """ A DEX description: a word, a name, an annotated word
+    or word variants.
+    """
+
+    roll = rng.random()
+    word = generate_word(rng)
+    if roll < NAME_SHARE:
+        return word.capitalize()
+    roll -= NAME_SHARE
+    if roll < ANNOTATION_SHARE:
+        return word + rng.choice(ANNOTATIONS)
+    roll -= ANNOTATION_SHARE
+    if roll < VARIANT_SHARE:
+        variant = word[:-1] + rng.choice("ăeiu")
+        return word + " / " + variant
+    roll -= VARIANT_SHARE
+    if roll < SHORT_SHARE:
+        return word[:2]
+    return word
+
+
+def write_dex_xml(path: str, entries: int, seed: int = 0) -> None:
+    """ Write 'entries' random entries to the xml file 'path'. """
+
+    rng = Random(seed)
+    with open(path, "w", encoding="utf-8") as file:
+        file.write('<?xml version="1.0" encoding="UTF-8"?>\n<Root>\n')
+        for entry_id in range(1, entries + 1):
+            timestamp = TIMESTAMP + entry_id * 60
+            description = escape(generate_description(rng))
+            file.write(
+                f'  <Entry id="{entry_id}">\n'
+                f'    <Timestamp>{timestamp}</Timestamp>\n'
+                f'    <Description>{description}</Description>\n'
+                f'  </Entry>\n')
+        file.write("</Root>\n")
+
+
+if __name__ == "__main__":
+    write_dex_xml(sys.argv[1], *(int(arg) for arg in sys.argv[2:]))
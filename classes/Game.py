@@ -1,42 +1,90 @@
 """ Game class module. """
 
+import time
+from dataclasses import dataclass, field
 from random import choice
 
+from classes import metrics
+from classes.events import EventSink, PrintSink
 from classes.word_dictionary import WordDictionary
-from classes.player import Player
+from classes.player import HumanPlayer, Player
 
 
+@dataclass
+class GameResult:
+    """ Game result. """
+
+    winner: str
+    rounds: int
+    # Played words in order
+    words: list[str] = field(default_factory=list)
+    # (round, player name) in order of elimination
+    eliminations: list[tuple[int, str]] = field(default_factory=list)
+
+
+@dataclass
 class Game:
-    """ Game class """
+    """ Game class.
+
+    sink - receives the game events instead of printing them
+    interactive - if False players don't ask questions
+    (headless games between AI players)
+    """
+
+    sink: EventSink = field(default_factory=PrintSink)
+    interactive: bool = True
 
     def play(self,
              players: list[Player],
              dictionary: WordDictionary
-             ) -> None:
-        """ Play the game. """
+             ) -> GameResult:
+        """ Play the game with a new session of 'dictionary'. """
+
+        session = dictionary.new_session()
 
         # Generate a start letter
         start_letter = choice("abcdefghijklmnopqrstuvwxyz")
 
         round_no = 1
         remaining_players = len(players)
+        player_removed = False
+        words = []
+        eliminations = []
 
         # Get word from players
         while remaining_players > 1:
-            print(f"\nRound {round_no}")
+            self.sink.emit("round", f"\nRound {round_no}", round=round_no)
             for player in players:
                 if player.eliminated:
                     continue
-                if (round_no == 1 and player == players[0]) or player_removed:
+                turn_start = time.perf_counter()
+                if (round_no == 1 and player is players[0]) or player_removed:
                     current_word = player.play(start_letter,
-                                               dictionary,
-                                               no_endgame_input=True)
+                                               session,
+                                               no_endgame_input=True,
+                                               sink=self.sink,
+                                               interactive=self.interactive)
                     player_removed = False
                 else:
-                    current_word = player.play(current_word[-2:], dictionary)
+                    if isinstance(player, HumanPlayer):
+                        # The next player thinks while the human does
+                        self.__next_player(players, player).ponder(
+                            current_word[-2:], session)
+                    current_word = player.play(current_word[-2:],
+                                               session,
+                                               sink=self.sink,
+                                               interactive=self.interactive)
+                if metrics.enabled():
+                    metrics.get_metrics().observe(
+                        "turn", time.perf_counter() - turn_start,
+                        player=type(player).__name__)
 
                 if current_word == "remove_player":
-                    print(f"\nPlayer '{player.name}' has been eliminated!")
+                    self.sink.emit(
+                        "eliminated",
+                        f"\nPlayer '{player.name}' has been eliminated!",
+                        player=player.name, round=round_no)
+                    eliminations.append((round_no, player.name))
                     player.eliminated = True
                     remaining_players -= 1
                     if remaining_players == 1:
@@ -45,16 +93,31 @@ class Game:
                         player_removed = True
                         start_letter = choice("abcdefghijklmnopqrstuvwxyz")
                 else:
-                    dictionary.discard_word(current_word)
+                    words.append(current_word)
+                    session.discard_word(current_word)
             else:
                 round_no += 1
 
         # Game ended; find the winner
         for player in players:
             if player.eliminated is False:
-                print(
+                self.sink.emit(
+                    "winner",
                     f"\nPlayer '{player.name}' has won the game "
-                    f"in {round_no} rounds!\n"
-                    )
+                    f"in {round_no} rounds!\n",
+                    player=player.name, rounds=round_no)
+                winner = player.name
                 break
-        dictionary.save_xml()
+        session.save_xml()
+        return GameResult(winner, round_no, words, eliminations)
+
+    @staticmethod
+    def __next_player(players: list[Player], player: Player) -> Player:
+        """ The first player after 'player' that isn't eliminated. """
+
+        index = next(index for index, other in enumerate(players)
+                     if other is player)
+        for other in players[index + 1:] + players[:index]:
+            if not other.eliminated:
+                return other
+        return player
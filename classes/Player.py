@@ -3,7 +3,10 @@
 from dataclasses import dataclass, field
 from random import random
 
-from classes.word_dictionary import WordDictionary
+from classes.events import EventSink, PrintSink
+from classes.game_session import GameSession
+from classes.solver import Solver
+from classes.word_store import bigram_id
 
 # Probability to suggest an ending word
 # From 1 (high probability) to 10 (no suggestion)
@@ -14,6 +17,32 @@ PROB_SUGGEST_WORD: float = 7.0
 # playable end game words to the next player
 SMART_AI_THRESHOLD: float = 6.0
 
+# Computer level that plays the words found by the solver
+EXPERT_AI_LEVEL: float = 11.0
+
+PRINT_SINK = PrintSink()
+
+
+def check_word(word: str,
+               word_start: str,
+               session: GameSession,
+               no_endgame_input: bool = False
+               ) -> str:
+    """ Get the reason why a player can't play 'word' ('' if it can).
+
+    Doesn't check if the word is in the dictionary.
+    """
+
+    if len(word) < 3:
+        return f"'{word}' has less than 3 letters!"
+    if not word.startswith(word_start):
+        return f"'{word}' doesn't starts with '{word_start}'"
+    if session.is_played(word):
+        return f"'{word}' has already been played this game!"
+    if no_endgame_input and session.is_endgame_word(word):
+        return "You can't eliminate a player with the first word!)"
+    return ""
+
 
 @dataclass
 class Player:
@@ -24,21 +53,34 @@ class Player:
 
     def play(self,
              word_start: str,
-             dictionary: WordDictionary,
-             no_endgame_input: bool = False
+             session: GameSession,
+             no_endgame_input: bool = False,
+             sink: EventSink = PRINT_SINK,
+             interactive: bool = True
              ) -> str:
-        """ Get a verified word from player. """
+        """ Get a verified word from player.
+
+        sink - receives the messages for the players
+        interactive - if False the player doesn't ask questions
+        """
 
         raise NotImplementedError
 
+    def ponder(self, word_start: str, session: GameSession) -> None:
+        """ Think ahead while the previous player chooses a word
+        that starts with 'word_start'.
+        """
+
 
 class HumanPlayer(Player):
     """ Human player class. """
 
     def play(self,
              word_start: str,
-             dictionary: WordDictionary,
-             no_endgame_input: bool = False
+             session: GameSession,
+             no_endgame_input: bool = False,
+             sink: EventSink = PRINT_SINK,
+             interactive: bool = True
              ) -> str:
         while True:
             word = input(
@@ -48,42 +90,48 @@ class HumanPlayer(Player):
             if word == "qq":
                 return "remove_player"
             if word == "h":
-                if dictionary.get_word(word_start):
-                    print(f"There are words that start with '{word_start}'")
+                if session.has_prefix(word_start):
+                    sink.emit("hint",
+                              f"There are words that start with "
+                              f"'{word_start}'",
+                              player=self.name, found=True)
                 else:
-                    print(f"There are no words that start with '{word_start}'")
-            elif len(word) < 3:
-                print(f"'{word}' has less than 3 letters!")
-                continue
-            elif not word.startswith(word_start):
-                print(f"'{word}' doesn't starts with '{word_start}'")
+                    sink.emit("hint",
+                              f"There are no words that start with "
+                              f"'{word_start}'",
+                              player=self.name, found=False)
+            elif error := check_word(
+                    word, word_start, session, no_endgame_input):
+                sink.emit("invalid_word", error, player=self.name, word=word)
                 continue
-            elif word in dictionary.played_words:
-                print(f"'{word}' has already been played this game!")
-                continue
-            elif no_endgame_input and word in dictionary.endgame_words:
-                print("You can't eliminate a player with the first word!)")
-                continue
-            elif word not in dictionary.words:
-                print(f"'{word}' is not in the dictionary!")
+            elif not session.is_game_word(word):
+                sink.emit("invalid_word",
+                          f"'{word}' is not in the dictionary!",
+                          player=self.name, word=word)
+                if suggestions := session.suggest_words(word, word_start):
+                    sink.emit("did_you_mean",
+                              f"Did you mean: {', '.join(suggestions)}?",
+                              player=self.name, word=word,
+                              suggestions=suggestions)
                 add_word_prompt = input(
                     f"Would you like to add '{word}' to the dictionary "
                     f"('yes' for yes)?: "
                     ).lower()
                 if add_word_prompt == "yes":
-                    dictionary.add_words(word)
+                    session.add_words(word)
                     return word
             else:
                 # Randomly suggest an endgame word
                 if (random() > (PROB_SUGGEST_WORD / 10)
                         and not no_endgame_input):
-                    suggest_word = dictionary.get_word(word_start, False)
+                    suggest_word = session.get_word(word_start, False)
                     if (suggest_word and
-                            suggest_word in dictionary.endgame_words):
-                        print(
+                            session.is_endgame_word(suggest_word)):
+                        sink.emit(
+                            "suggestion",
                             f"... You could have eliminated next player "
-                            f"with '{suggest_word}'"
-                            )
+                            f"with '{suggest_word}'",
+                            player=self.name, word=suggest_word)
                 return word
 
 
@@ -93,42 +141,96 @@ class AiPlayer(Player):
 
     ai_level: float = 5.0
     smart: bool = field(default=False, init=False)
+    expert: bool = field(default=False, init=False)
+    solver: Solver | None = field(default=None, init=False, repr=False)
 
     def __post_init__(self):
         if self.ai_level >= SMART_AI_THRESHOLD:
             self.smart = True
+        if self.ai_level >= EXPERT_AI_LEVEL:
+            self.expert = True
         self.ai_level: float = self.ai_level / 10
 
+    def get_word(self,
+                 word_start: str,
+                 session: GameSession,
+                 no_endgame: bool
+                 ) -> str:
+        """ Get a word, the expert level first asks the solver.
+
+        Smart levels answer first moves from the opening book
+        (if the dictionary has one).
+        """
+
+        if self.smart and len(word_start) == 1 and no_endgame:
+            book = session.dictionary.opening_book()
+            if book is not None and (
+                    word := book.get_word(session, word_start)):
+                return word
+        if self.solver is not None:
+            self.solver.stop_speculation()
+        if self.expert and len(word_start) == 2:
+            if word := self.__solver(session).best_word(
+                    session, word_start):
+                return word
+        return session.get_word(word_start, no_endgame, self.smart)
+
+    def ponder(self, word_start: str, session: GameSession) -> None:
+        """ The expert level solves its replies to the likely words
+        of the previous player in the background.
+        """
+
+        if self.expert and len(word_start) == 2:
+            self.__solver(session).speculate(session, bigram_id(word_start))
+
+    def __solver(self, session: GameSession) -> Solver:
+        if self.solver is None or (
+                self.solver.dictionary is not session.dictionary):
+            self.solver = Solver(session.dictionary)
+        return self.solver
+
     def play(self,
              word_start: str,
-             dictionary: WordDictionary,
-             no_endgame_input: bool = False
+             session: GameSession,
+             no_endgame_input: bool = False,
+             sink: EventSink = PRINT_SINK,
+             interactive: bool = True
              ) -> str:
 
         # Randomly try to end the game
         no_endgame = no_endgame_input or random() > self.ai_level
 
         while True:
-            word = dictionary.get_word(word_start, no_endgame, self.smart)
+            word = self.get_word(word_start, session, no_endgame)
             if (word == "" or
                     (no_endgame_input is True and
-                     word in dictionary.endgame_words)):
-                print(f"\n'{self.name}' enter a word that starts "
-                      f"with '{word_start}': qq")
+                     session.is_endgame_word(word))):
+                sink.emit("word",
+                          f"\n'{self.name}' enter a word that starts "
+                          f"with '{word_start}': qq",
+                          player=self.name, word="")
                 if word != "":
-                    print("I can't find a word that doesn't end the game!")
+                    sink.emit("no_word",
+                              "I can't find a word that doesn't end the game!",
+                              player=self.name)
                 return "remove_player"
             else:
-                print(f"\n'{self.name}' enter a word that starts "
-                      f"with '{word_start}': {word}")
-                if word in dictionary.endgame_words:
-                    print(
-                        f"There are no words in dictionary with {word[-2:]}!")
+                sink.emit("word",
+                          f"\n'{self.name}' enter a word that starts "
+                          f"with '{word_start}': {word}",
+                          player=self.name, word=word)
+                if session.is_endgame_word(word):
+                    sink.emit(
+                        "endgame_word",
+                        f"There are no words in dictionary with {word[-2:]}!",
+                        player=self.name, word=word)
+                if not interactive:
+                    return word
                 remove_word = input(
                     f"Type 'remove' to remove '{word}' from dictionary: "
                     ).lower()
                 if remove_word == "remove":
-                    dictionary.discard_word(word, remove=True)
+                    session.discard_word(word, remove=True)
                     continue
                 else:
                     return word
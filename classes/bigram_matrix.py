@@ -0,0 +1,82 @@
+""" Bigram Matrix class module.
+
+Count the game words by (start bigram, end bigram). Every endgame
+question is answered from the counts, independent of the number of words.
+"""
+
+from array import array
+from typing import Iterable
+
+from classes.word_store import BIGRAMS
+
+
+class BigramMatrix:
+    """ Number of game words for every (start bigram, end bigram) pair.
+
+    The counts are kept in one flat array, the (start, end) count is
+    counts[start * BIGRAMS + end]. Rows and columns are array slices,
+    so summing them runs in C.
+    """
+
+    counts: array
+    # Number of game words for each start bigram (row sums)
+    start_counts: array
+    # Number of endgame words for each start bigram
+    endgame_starts: array
+
+    def __init__(self, starts: Iterable[int], ends: Iterable[int]) -> None:
+        """ Count the words with the 'starts' and 'ends' bigram ids. """
+
+        self.counts = array("I", bytes(4 * BIGRAMS * BIGRAMS))
+        for start, end in zip(starts, ends):
+            self.counts[start * BIGRAMS + end] += 1
+        self.start_counts = array(
+            "I", (sum(self.row(start)) for start in range(BIGRAMS)))
+        self.endgame_starts = array("I", bytes(4 * BIGRAMS))
+        for bigram in self.endgame_bigrams():
+            self.__add_endgame_words(bigram)
+
+    def count(self, start: int, end: int) -> int:
+        """ Number of words that start with 'start' and end with 'end'. """
+
+        return self.counts[start * BIGRAMS + end]
+
+    def row(self, start: int) -> array:
+        """ Word counts of the 'start' bigram for every end bigram. """
+
+        return self.counts[start * BIGRAMS:(start + 1) * BIGRAMS]
+
+    def column(self, end: int) -> array:
+        """ Word counts of the 'end' bigram for every start bigram. """
+
+        return self.counts[end::BIGRAMS]
+
+    def endgame_bigrams(self) -> list[int]:
+        """ Bigrams no word starts with, words ending with them end
+        the game.
+        """
+
+        return [bigram for bigram, count in enumerate(self.start_counts)
+                if not count]
+
+    def discard(self, start: int, end: int) -> None:
+        """ Remove a word that starts with 'start' and ends with 'end'.
+
+        When the last word that starts with a bigram is gone, the words
+        that end with that bigram become endgame words.
+        """
+
+        if not self.start_counts[end]:
+            # It was an endgame word
+            self.endgame_starts[start] -= 1
+        self.counts[start * BIGRAMS + end] -= 1
+        self.start_counts[start] -= 1
+        if not self.start_counts[start]:
+            self.__add_endgame_words(start)
+
+    def __add_endgame_words(self, bigram: int) -> None:
+        """ Count the words that end with 'bigram' as endgame words. """
+
+        for start, count in enumerate(self.column(bigram)):
+            if count:
+                self.endgame_starts[start] += count
@@ -0,0 +1,39 @@
+""" Game events module.
+
+The game reports what happens through an event sink instead of printing,
+so games can also run without a terminal.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Protocol
+
+
+class EventSink(Protocol):
+    """ Receives the game events. """
+
+    def emit(self, event: str, message: str, **data: Any) -> None:
+        """ Handle the 'event' with a human readable 'message'. """
+
+
+class PrintSink:
+    """ Print the game events (interactive games). """
+
+    def emit(self, event: str, message: str, **data: Any) -> None:
+        print(message)
+
+
+class NullSink:
+    """ Ignore the game events (simulations). """
+
+    def emit(self, event: str, message: str, **data: Any) -> None:
+        pass
+
+
+@dataclass
+class RecordingSink:
+    """ Keep the game events in memory. """
+
+    events: list[tuple[str, dict[str, Any]]] = field(default_factory=list)
+
+    def emit(self, event: str, message: str, **data: Any) -> None:
+        self.events.append((event, data))
@@ -0,0 +1,402 @@
+""" Game Session class module. """
+
+from itertools import chain
+from random import choice, randrange
+from typing import TYPE_CHECKING
+
+from classes import metrics
+from classes.spell_index import MAX_EDIT_DISTANCE, edit_distance
+from classes.word_store import (BIGRAMS, bigram_text, get_bit, new_bitset,
+                                set_bit)
+from classes.word_trie import WordTrie
+
+if TYPE_CHECKING:
+    from classes.word_dictionary import WordDictionary
+
+# Number of words suggested for a misspelled word
+SUGGESTED_WORDS: int = 3
+
+
+class GameSession:
+    """ The words of one game played with a shared word dictionary.
+
+    The dictionary isn't changed by the game. The session only keeps
+    the played words and how they change the start bigram counts
+    and the endgame words, so creating a session doesn't copy any word.
+    Played dictionary words are marked by word id in a bitset that is
+    allocated with the first played word.
+
+    With a 'WordTrie' store the session also counts the played words
+    under every trie node, so prefix queries don't scan the prefix words.
+    """
+
+    dictionary: "WordDictionary"
+    __played: bytearray | None
+    __played_ids: list[int]
+    __other_words: set[str]
+    __version: int
+    __played_starts: dict[int, int]
+    __played_pairs: dict[int, int]
+    __endgame_starts: dict[int, int]
+    __played_nodes: dict[int, int]
+
+    def __init__(self, dictionary: "WordDictionary") -> None:
+        """ Start a game with the words from 'dictionary'. """
+
+        self.dictionary = dictionary
+        # Played dictionary words (bitset and word ids)
+        self.__played = None
+        self.__played_ids = []
+        # Played words that aren't in the dictionary store (added words)
+        self.__other_words = set()
+        # Dictionary version the counts below are computed for
+        self.__version = dictionary.version
+        # Number of played game words for each start bigram id
+        self.__played_starts = {}
+        # ... and for each (start, end) bigram matrix cell
+        self.__played_pairs = {}
+        # Change of the number of endgame words for each start bigram id
+        self.__endgame_starts = {}
+        # Number of played game words under each trie node
+        self.__played_nodes = {}
+
+    # region: game words
+    @property
+    def played_words(self) -> set[str]:
+        """ Set of the words played this game. """
+
+        store = self.dictionary.store
+        return ({store[word_id] for word_id in self.__played_ids}
+                | self.__other_words)
+
+    def is_played(self, word: str) -> bool:
+        """ Check if 'word' was played this game. """
+
+        if word in self.__other_words:
+            return True
+        word_id = self.dictionary.store.word_id(word)
+        return word_id >= 0 and self.__is_played_id(word_id)
+
+    @property
+    def played_pairs(self) -> dict[int, int]:
+        """ Number of played game words for each (start, end) bigram
+        matrix cell.
+        """
+
+        self.__sync()
+        return dict(self.__played_pairs)
+
+    def __is_played_id(self, word_id: int) -> bool:
+        return self.__played is not None and get_bit(self.__played, word_id)
+
+    def is_game_word(self, word: str) -> bool:
+        """ Check if 'word' can still be played in this game. """
+
+        word_id = self.dictionary.word_id(word)
+        return word_id >= 0 and not self.__is_played_id(word_id)
+
+    def is_endgame_word(self, word: str) -> bool:
+        """ Check if 'word' leaves no words to the next player. """
+
+        self.__sync()
+        word_id = self.dictionary.word_id(word)
+        return (word_id >= 0 and not self.__is_played_id(word_id)
+                and not self.__start_count(
+                    self.dictionary.store.ends[word_id]))
+
+    def __start_count(self, bigram: int) -> int:
+        """ Number of game words that start with the 'bigram' id. """
+
+        return (self.dictionary.start_count(bigram)
+                - self.__played_starts.get(bigram, 0))
+
+    def __endgame_start_count(self, bigram: int) -> int:
+        """ Number of endgame words that start with the 'bigram' id. """
+
+        return (self.dictionary.endgame_start_count(bigram)
+                + self.__endgame_starts.get(bigram, 0))
+
+    def __sync(self) -> None:
+        """ Recount the played words if the dictionary words changed. """
+
+        if self.__version == self.dictionary.version:
+            return
+        self.__version = self.dictionary.version
+        store = self.dictionary.store
+        self.__played_starts = {}
+        self.__played_pairs = {}
+        self.__endgame_starts = {}
+        self.__played_nodes = {}
+        played = [word_id for word_id in self.__played_ids
+                  if not self.dictionary.is_removed(word_id)]
+        for word_id in played:
+            start = store.starts[word_id]
+            self.__count_played(word_id, start, store.ends[word_id])
+            if self.dictionary.is_endgame_id(word_id):
+                self.__endgame_starts[start] = (
+                    self.__endgame_starts.get(start, 0) - 1)
+        for bigram in self.__played_starts:
+            if not self.__start_count(bigram):
+                self.__add_endgame_words(bigram)
+
+    def __count_played(self, word_id: int, start: int, end: int) -> None:
+        """ Count the played word 'word_id' that starts with 'start'
+        and ends with 'end'.
+        """
+
+        self.__played_starts[start] = self.__played_starts.get(start, 0) + 1
+        pair = start * BIGRAMS + end
+        self.__played_pairs[pair] = self.__played_pairs.get(pair, 0) + 1
+        store = self.dictionary.store
+        if isinstance(store, WordTrie):
+            for node in store.path(word_id):
+                self.__played_nodes[node] = (
+                    self.__played_nodes.get(node, 0) + 1)
+
+    def __count(self, start: int, end: int) -> int:
+        """ Number of game words that start with 'start'
+        and end with 'end'.
+        """
+
+        return (self.dictionary.matrix.count(start, end)
+                - self.__played_pairs.get(start * BIGRAMS + end, 0))
+
+    def __add_endgame_words(self, bigram: int) -> None:
+        """ Count the words that end with 'bigram' as endgame words. """
+
+        column = self.dictionary.matrix.column(bigram)
+        for start, count in enumerate(column):
+            if count:
+                count = self.__count(start, bigram)
+                self.__endgame_starts[start] = (
+                    self.__endgame_starts.get(start, 0) + count)
+
+    def difficulty(self, bigram: int) -> float:
+        """ Share of the words that start with the 'bigram' id and let
+        the next player end the game (1.0 if there are no words).
+        """
+
+        self.__sync()
+        words = self.__start_count(bigram)
+        if not words:
+            return 1.0
+        risky = sum(
+            self.__count(bigram, end)
+            for end, count in enumerate(self.dictionary.matrix.row(bigram))
+            if count and self.__endgame_start_count(end))
+        return risky / words
+
+    def is_trap(self, bigram: int) -> bool:
+        """ Check if every word that starts with the 'bigram' id
+        lets the next player end the game.
+
+        A player can't end the game from a trap bigram.
+        """
+
+        self.__sync()
+        return (self.__start_count(bigram) > 0
+                and not self.__endgame_start_count(bigram)
+                and self.difficulty(bigram) == 1.0)
+
+    def __mark_played(self, word: str) -> None:
+        """ Add 'word' to the played words. """
+
+        word_id = self.dictionary.store.word_id(word)
+        if word_id < 0:
+            self.__other_words.add(word)
+            return
+        if self.__played is None:
+            self.__played = new_bitset(len(self.dictionary.store))
+        if not get_bit(self.__played, word_id):
+            set_bit(self.__played, word_id)
+            self.__played_ids.append(word_id)
+    # endregion
+
+    # region: play words
+    def discard_word(self, word: str, remove: bool = False) -> None:
+        """ Remove a word from current game.
+
+        remove - also remove the word from the dictionary
+        """
+
+        with metrics.timer("discard_word"):
+            self.__sync()
+            word_id = self.dictionary.word_id(word)
+            game_word = word_id >= 0 and not self.__is_played_id(word_id)
+            self.__mark_played(word)
+            if game_word:
+                store = self.dictionary.store
+                start, end = store.starts[word_id], store.ends[word_id]
+                if not self.__start_count(end):
+                    self.__endgame_starts[start] = (
+                        self.__endgame_starts.get(start, 0) - 1)
+                self.__count_played(word_id, start, end)
+                # The last word that starts with a bigram makes the words
+                # that end with that bigram endgame words
+                if not self.__start_count(start):
+                    self.__add_endgame_words(start)
+        if remove:
+            self.dictionary.remove_words(word)
+            print(f"... Removed '{word}' from game ...")
+
+    def add_words(self, *words: str) -> None:
+        """ Add new word(s) to dictionary and play them. """
+
+        for word in words:
+            self.__mark_played(word)
+        self.dictionary.add_words(*words)
+
+    def save_xml(self) -> None:
+        """ Save the dictionary changes (in the background). """
+
+        self.dictionary.save_xml()
+    # endregion
+
+    # region: get game words
+    def get_word(self,
+                 word_start: str,
+                 no_endgame: bool = True,
+                 smart_ai: bool = False
+                 ) -> str:
+        """Get a random word from dictionary that starts with 'word_start'."""
+
+        with metrics.timer("get_word", smart="yes" if smart_ai else "no"):
+            return self.__get_word(word_start, no_endgame, smart_ai)
+
+    def has_prefix(self, word_start: str) -> bool:
+        """ Check if a word that starts with 'word_start' can still
+        be played.
+        """
+
+        self.__sync()
+        store = self.dictionary.store
+        if isinstance(store, WordTrie):
+            return store.live_count(word_start, self.__played_nodes) > 0
+        return any(not self.dictionary.is_removed(word_id)
+                   and not self.__is_played_id(word_id)
+                   for word_id in store.prefix_ids(word_start))
+
+    def random_word(self, word_start: str) -> str:
+        """ Get a random word that starts with 'word_start' and can
+        still be played ('' if there is none).
+        """
+
+        self.__sync()
+        store = self.dictionary.store
+        if isinstance(store, WordTrie):
+            word_id = self.__sample_id(store, word_start)
+            return store[word_id] if word_id >= 0 else ""
+        word_ids = [word_id for word_id in store.prefix_ids(word_start)
+                    if not self.dictionary.is_removed(word_id)
+                    and not self.__is_played_id(word_id)]
+        return store[choice(word_ids)] if word_ids else ""
+
+    def __sample_id(self, store: WordTrie, word_start: str) -> int:
+        """ Id of a random word that starts with 'word_start' and can
+        still be played (-1 if there is none).
+        """
+
+        count = store.live_count(word_start, self.__played_nodes)
+        if not count:
+            return -1
+        return store.sample_id(word_start, randrange(count),
+                               self.__played_nodes)
+
+    def __get_word(self,
+                   word_start: str,
+                   no_endgame: bool,
+                   smart_ai: bool
+                   ) -> str:
+        self.__sync()
+        store = self.dictionary.store
+        ids = self.dictionary.prefix_ids(word_start)
+        if isinstance(store, WordTrie):
+            # Start the search at a random word that can be played
+            word_id = self.__sample_id(store, word_start)
+            if word_id < 0:
+                return ""
+            offset = word_id - ids.start
+        else:
+            # Start the search at a random word
+            offset = randrange(len(ids)) if ids else 0
+        # First found word id of each kind (-1 if not found):
+        # any word that starts with 'word_start'
+        word = -1
+        # word with an ending which doesn't remove next player
+        not_endgame_word = -1
+        # word with an ending which removes next player
+        endgame_word = -1
+        # word with an ending which doesn't remove next player,
+        # but also leaves no endgame words to him
+        smart_ai_word = -1
+        for word_id in chain(ids[offset:], ids[:offset]):
+            if (self.dictionary.is_removed(word_id)
+                    or self.__is_played_id(word_id)):
+                continue
+            if word < 0:
+                word = word_id
+            end = store.ends[word_id]
+            if not self.__start_count(end):
+                if endgame_word < 0:
+                    endgame_word = word_id
+            elif not_endgame_word < 0 or smart_ai and smart_ai_word < 0:
+                if not_endgame_word < 0:
+                    not_endgame_word = word_id
+                if smart_ai and not self.__endgame_start_count(end):
+                    smart_ai_word = word_id
+            if (endgame_word >= 0 and not_endgame_word >= 0
+                    and (smart_ai_word >= 0 or not smart_ai)):
+                break
+
+        if word < 0:
+            return ""
+        if no_endgame:
+            # Try to get a word that doesn't end the game
+            if smart_ai_word >= 0:
+                return store[smart_ai_word]
+            if not_endgame_word >= 0:
+                return store[not_endgame_word]
+            return store[word]
+        # Try to get a word that ends the game
+        if endgame_word >= 0:
+            return store[endgame_word]
+        if smart_ai_word >= 0:
+            return store[smart_ai_word]
+        return store[word]
+
+    def suggest_words(self,
+                      word: str,
+                      word_start: str,
+                      count: int = SUGGESTED_WORDS
+                      ) -> list[str]:
+        """ Get the game words closest to a misspelled 'word' that start
+        with 'word_start' and weren't played.
+        """
+
+        store = self.dictionary.store
+        suggestions = []
+        for word_id in self.dictionary.spell_index.candidates(word):
+            if (self.dictionary.is_removed(word_id)
+                    or self.__is_played_id(word_id)):
+                continue
+            suggestion = store[word_id]
+            if not suggestion.startswith(word_start):
+                continue
+            distance = edit_distance(word, suggestion)
+            if distance <= MAX_EDIT_DISTANCE:
+                suggestions.append((distance, suggestion))
+        return [suggestion for _, suggestion in sorted(suggestions)[:count]]
+
+    def get_pair_word(self, start: int, end: int) -> str:
+        """ Get a word that starts with the 'start' bigram id and ends
+        with the 'end' bigram id ('' if there is none).
+        """
+
+        store = self.dictionary.store
+        for word_id in self.dictionary.prefix_ids(bigram_text(start)):
+            if (store.ends[word_id] == end
+                    and not self.dictionary.is_removed(word_id)
+                    and not self.__is_played_id(word_id)):
+                return store[word_id]
+        return ""
+    # endregion
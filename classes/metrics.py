@@ -0,0 +1,179 @@
+""" Metrics module.
+
+Opt-in timers and counters for the hot paths. Nothing is measured
+until a metrics sink is installed with 'set_metrics'.
+"""
+
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Protocol
+
+# Prefix of the Prometheus metric names
+PROMETHEUS_PREFIX: str = "fazan_"
+
+
+class MetricsSink(Protocol):
+    """ Receives the measured times and counts. """
+
+    def observe(self, name: str, seconds: float, **labels: str) -> None:
+        """ Record that 'name' took 'seconds'. """
+
+    def count(self, name: str, value: int = 1, **labels: str) -> None:
+        """ Add 'value' to the 'name' counter. """
+
+
+class NullMetrics:
+    """ Ignore the metrics (default). """
+
+    def observe(self, name: str, seconds: float, **labels: str) -> None:
+        pass
+
+    def count(self, name: str, value: int = 1, **labels: str) -> None:
+        pass
+
+
+@dataclass
+class TimerStats:
+    """ Summary of the times of an operation. """
+
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+@dataclass
+class MemoryMetrics:
+    """ Keep the metrics summaries in memory. """
+
+    timers: dict[tuple[str, tuple[tuple[str, str], ...]], TimerStats] = (
+        field(default_factory=dict))
+    counters: dict[tuple[str, tuple[tuple[str, str], ...]], int] = (
+        field(default_factory=dict))
+
+    def observe(self, name: str, seconds: float, **labels: str) -> None:
+        stats = self.timers.setdefault(
+            (name, tuple(sorted(labels.items()))), TimerStats())
+        stats.count += 1
+        stats.total += seconds
+        stats.max = max(stats.max, seconds)
+
+    def count(self, name: str, value: int = 1, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def prometheus(self) -> str:
+        """ The metrics in the Prometheus text format. """
+
+        lines = []
+        for (name, labels), stats in sorted(self.timers.items()):
+            metric = f"{PROMETHEUS_PREFIX}{name}_seconds"
+            text = _prometheus_labels(labels)
+            lines.append(f"{metric}_count{text} {stats.count}")
+            lines.append(f"{metric}_sum{text} {stats.total:.9f}")
+            lines.append(f"{metric}_max{text} {stats.max:.9f}")
+        for (name, labels), value in sorted(self.counters.items()):
+            lines.append(f"{PROMETHEUS_PREFIX}{name}_total"
+                         f"{_prometheus_labels(labels)} {value}")
+        return "".join(line + "\n" for line in lines)
+
+    def save_prometheus(self, path: str) -> None:
+        """ Write the Prometheus text dump to 'path'. """
+
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(self.prometheus())
+
+
+class JsonLinesMetrics:
+    """ Append every measurement to a JSON lines file. """
+
+    path: str
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def observe(self, name: str, seconds: float, **labels: str) -> None:
+        self.__write({"metric": name, "seconds": seconds, **labels})
+
+    def count(self, name: str, value: int = 1, **labels: str) -> None:
+        self.__write({"metric": name, "count": value, **labels})
+
+    def __write(self, record: dict) -> None:
+        record["time"] = time.time()
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(record) + "\n")
+
+
+def _prometheus_labels(labels: tuple[tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(
+        f'{key}="{value}"' for key, value in labels) + "}"
+
+
+class _Timer:
+    """ Context manager that observes the time of its block. """
+
+    __slots__ = ("name", "labels", "start")
+
+    def __init__(self, name: str, labels: dict[str, str]) -> None:
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        _metrics.observe(
+            self.name, time.perf_counter() - self.start, **self.labels)
+
+
+class _NullTimer:
+    """ Context manager that does nothing (metrics are off). """
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+
+_metrics: MetricsSink = NullMetrics()
+_NULL_TIMER = _NullTimer()
+
+
+def set_metrics(sink: MetricsSink | None) -> None:
+    """ Install the metrics 'sink' (None turns the metrics off). """
+
+    global _metrics
+    _metrics = sink if sink is not None else NullMetrics()
+
+
+def get_metrics() -> MetricsSink:
+    return _metrics
+
+
+def enabled() -> bool:
+    """ Check if a metrics sink is installed. """
+
+    return not isinstance(_metrics, NullMetrics)
+
+
+def timer(name: str, **labels: str) -> _Timer | _NullTimer:
+    """ Time a block: 'with timer("save_xml"): ...'. """
+
+    if isinstance(_metrics, NullMetrics):
+        return _NULL_TIMER
+    return _Timer(name, labels)
+
+
+def count(name: str, value: int = 1, **labels: str) -> None:
+    """ Add 'value' to the 'name' counter. """
+
+    _metrics.count(name, value, **labels)
@@ -0,0 +1,120 @@
+""" Opening Book class module.
+
+The first word of a game (or after a player is eliminated) must not end
+the game. The strongest safe first words are ranked once for every start
+letter and saved next to the compiled dictionary.
+"""
+
+import os
+import pickle
+from typing import TYPE_CHECKING
+
+from classes.solver import Solver
+from classes.word_source import write_atomic
+from classes.word_store import ALPHABET, bigram_id
+
+if TYPE_CHECKING:
+    from classes.game_session import GameSession
+    from classes.word_dictionary import WordDictionary
+
+# Opening book file is saved next to the xml file
+BOOK_SUFFIX: str = ".book"
+# Increase when the opening book content changes
+BOOK_VERSION: int = 1
+# Number of openings kept for every start letter
+BOOK_SIZE: int = 10
+# Positions searched by the solver for every end bigram of the openings
+BOOK_SOLVER_NODES: int = 2_000
+
+
+class OpeningBook:
+    """ Ranked safe opening words for every start letter.
+
+    An opening is ranked by the position it leaves to the next player:
+    lost (solved), trap or by the share of words that let him
+    end the game. Only one word is kept for every (start, end) bigram
+    pair, another word of the same pair is as strong.
+    """
+
+    openings: dict[str, list[str]]
+    # Fingerprint of the dictionary words the book was built for
+    fingerprint: str
+
+    def __init__(self, openings: dict[str, list[str]],
+                 fingerprint: str) -> None:
+        self.openings = openings
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def build(cls,
+              dictionary: "WordDictionary",
+              size: int = BOOK_SIZE,
+              max_nodes: int = BOOK_SOLVER_NODES
+              ) -> "OpeningBook":
+        """ Rank the openings of 'dictionary'. """
+
+        print("... Building opening book ...")
+        session = dictionary.new_session()
+        solver = Solver(dictionary, max_nodes)
+        # Rank of the position left to the next player by every end bigram
+        ranks = {}
+        openings = {}
+        for letter in ALPHABET:
+            pairs = {}
+            for word in dictionary.prefix_words(letter):
+                end = bigram_id(word[-2:])
+                if dictionary.start_count(end):
+                    pairs.setdefault((word[:2], end), word)
+            for (_, end) in pairs:
+                if end not in ranks:
+                    ranks[end] = (solver.solve(session, end) is False,
+                                  session.is_trap(end),
+                                  session.difficulty(end))
+            ranked = sorted(pairs.items(),
+                            key=lambda pair: (ranks[pair[0][1]], pair[1]),
+                            reverse=True)
+            openings[letter] = [word for _, word in ranked[:size]]
+        return cls(openings, dictionary.fingerprint())
+
+    @classmethod
+    def load(cls, path: str, fingerprint: str) -> "OpeningBook | None":
+        """ Load the opening book if it matches the 'fingerprint'. """
+
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "rb") as file:
+                book = pickle.load(file)
+            if (book["version"] != BOOK_VERSION or
+                    book["fingerprint"] != fingerprint):
+                return None
+        # A corrupt opening book is rebuilt
+        except Exception:
+            return None
+        return cls(book["openings"], fingerprint)
+
+    def save(self, path: str) -> None:
+        """ Save the opening book. """
+
+        book = {
+            "version": BOOK_VERSION,
+            "fingerprint": self.fingerprint,
+            "openings": self.openings,
+            }
+        try:
+            write_atomic(path, lambda file: pickle.dump(
+                book, file, pickle.HIGHEST_PROTOCOL))
+        except OSError as err:
+            print(f"... Couldn't save opening book: {err} ...")
+
+    def get_word(self, session: "GameSession", letter: str) -> str:
+        """ Get the strongest opening that can still be played
+        ('' if none is left).
+        """
+
+        for opening in self.openings.get(letter, ()):
+            word = session.get_pair_word(bigram_id(opening[:2]),
+                                         bigram_id(opening[-2:]))
+            if word and not session.is_endgame_word(word):
+                return word
+        return ""
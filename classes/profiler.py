@@ -0,0 +1,188 @@
+""" Profiler module.
+
+Profile loading the dictionary, computer games and saving dictionary
+changes with cProfile and tracemalloc, and report the hot functions
+and the peak memory of every phase.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import shutil
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from random import Random
+
+from classes.events import NullSink
+from classes.game import Game
+from classes.player import AiPlayer, EXPERT_AI_LEVEL
+from classes.word_dictionary import WordDictionary
+
+# Levels of the computer players of the profiled games
+PROFILE_AI_LEVELS: tuple[float, ...] = (5.0, 10.0, EXPERT_AI_LEVEL)
+# Functions listed for every phase
+PROFILE_TOP: int = 15
+# Words added and removed in the save phase
+PROFILE_CHANGED_WORDS: int = 100
+
+
+@dataclass
+class PhaseProfile:
+    """ Time, memory and hot functions of a profiled phase. """
+
+    name: str
+    seconds: float = 0.0
+    # Peak of the memory allocated during the phase, in bytes
+    peak_memory: int = 0
+    # Sorted by cumulative time
+    hot_functions: str = ""
+    # Lines that hold the most memory at the end of the phase
+    memory_lines: list[str] = field(default_factory=list)
+
+
+@dataclass
+class ProfileReport:
+    """ Profile of every phase, in order. """
+
+    phases: list[PhaseProfile] = field(default_factory=list)
+    # Computer moves played in the 'moves' phase
+    moves: int = 0
+
+    def summary(self) -> str:
+        """ Table of the time and peak memory of every phase. """
+
+        lines = [f"{'phase':<8} {'time':>10} {'peak memory':>12}"]
+        for phase in self.phases:
+            lines.append(f"{phase.name:<8} {phase.seconds:>9.3f}s "
+                         f"{phase.peak_memory / 2**20:>9.1f} MiB")
+        moves = self.phase("moves")
+        if moves is not None and self.moves:
+            lines.append(f"{self.moves} moves, "
+                         f"{moves.seconds / self.moves * 1000:.3f} ms/move")
+        return "\n".join(lines)
+
+    def details(self) -> str:
+        """ Summary followed by the hot functions and the memory lines
+        of every phase.
+        """
+
+        sections = [self.summary()]
+        for phase in self.phases:
+            sections.append(
+                f"=== {phase.name} ===\n{phase.hot_functions}"
+                "Memory at the end of the phase:\n"
+                + "".join(line + "\n" for line in phase.memory_lines))
+        return "\n\n".join(sections)
+
+    def phase(self, name: str) -> PhaseProfile | None:
+        for phase in self.phases:
+            if phase.name == name:
+                return phase
+        return None
+
+    def save(self, path: str) -> None:
+        """ Write the detailed report to 'path'. """
+
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(self.details())
+
+
+class _Phase:
+    """ Context manager that profiles its block as a phase. """
+
+    def __init__(self, report: ProfileReport, name: str, top: int) -> None:
+        self.report = report
+        self.phase = PhaseProfile(name)
+        self.top = top
+        self.profile = cProfile.Profile()
+
+    def __enter__(self) -> None:
+        print(f"... Profiling {self.phase.name} ...")
+        tracemalloc.reset_peak()
+        self.start_memory = tracemalloc.get_traced_memory()[0]
+        self.start = time.perf_counter()
+        self.profile.enable()
+
+    def __exit__(self, *exc_info) -> None:
+        self.profile.disable()
+        self.phase.seconds = time.perf_counter() - self.start
+        self.phase.peak_memory = (
+            tracemalloc.get_traced_memory()[1] - self.start_memory)
+        # Taken before the report allocates memory
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, cProfile.__file__),
+            ))
+        self.phase.memory_lines = [
+            str(statistic)
+            for statistic in snapshot.statistics("lineno")[:self.top]]
+        stream = io.StringIO()
+        stats = pstats.Stats(self.profile, stream=stream)
+        stats.strip_dirs().sort_stats("cumulative").print_stats(self.top)
+        self.phase.hot_functions = stream.getvalue()
+        self.report.phases.append(self.phase)
+
+
+def run_profile(path: str,
+                games: int,
+                levels: tuple[float, ...] = PROFILE_AI_LEVELS,
+                top: int = PROFILE_TOP,
+                seed: int = 0
+                ) -> ProfileReport:
+    """ Profile the dictionary from the xml file 'path' and 'games'
+    games between the computer 'levels'.
+
+    Phases:
+    build - parse the xml file, filter the words, index them and build
+    the opening book
+    load - load the compiled dictionary and the opening book
+    endgame - compute the endgame words
+    moves - play the games
+    save - save added and removed words and compact them into the xml
+
+    The xml file is copied to a temp folder, so it isn't changed.
+    """
+
+    report = ProfileReport()
+    rng = Random(seed)
+    started = tracemalloc.is_tracing()
+    if not started:
+        tracemalloc.start()
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            xml_path = os.path.join(directory, os.path.basename(path))
+            shutil.copyfile(path, xml_path)
+
+            with _Phase(report, "build", top):
+                WordDictionary(xml_path)
+            with _Phase(report, "load", top):
+                dictionary = WordDictionary(xml_path)
+            with _Phase(report, "endgame", top):
+                # The endgame words are only collected on demand
+                len(dictionary.endgame_words)
+
+            game = Game(sink=NullSink(), interactive=False)
+            with _Phase(report, "moves", top):
+                for _ in range(games):
+                    players = [
+                        AiPlayer(f"level {level:g}", ai_level=level)
+                        for level in levels]
+                    rng.shuffle(players)
+                    result = game.play(players, dictionary)
+                    report.moves += len(result.words)
+
+            words = sorted(dictionary.words)
+            changed = rng.sample(
+                words, min(PROFILE_CHANGED_WORDS, len(words)))
+            with _Phase(report, "save", top):
+                dictionary.add_words(*(word + "zz" for word in changed))
+                dictionary.remove_words(*changed)
+                dictionary.save_xml()
+                dictionary.compact_xml()
+    finally:
+        if not started:
+            tracemalloc.stop()
+    return report
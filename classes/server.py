@@ -0,0 +1,185 @@
+""" Game server module.
+
+Host many games against the computer over a local line protocol.
+All games share one loaded word dictionary.
+
+Client commands (one per line):
+    NEW <level>     start a game against a computer of 'level' (1...10)
+    WORD <word>     play 'word'
+    HINT            ask if there are words for the current start
+    QUIT            give up the current game (or close the connection
+                    if no game is played)
+
+Server replies (one per line):
+    READY                       connection accepted
+    TURN <word start>           enter a word that starts with 'word start'
+    AI <word>                   the computer played 'word' ('qq' gives up)
+    HINT yes|no                 answer to 'HINT'
+    WIN | LOSE                  the game ended
+    ERROR <message>             the command was rejected
+"""
+
+import asyncio
+from random import choice
+
+from classes.events import NullSink
+from classes.game_session import GameSession
+from classes.player import AiPlayer, check_word
+from classes.word_dictionary import WordDictionary
+
+# Lines longer than this close the connection
+MAX_LINE_LENGTH: int = 1024
+
+
+class ClientGame:
+    """ A game between a connected client and a computer player. """
+
+    session: GameSession
+    ai_player: AiPlayer
+    word_start: str
+    first_word: bool
+
+    def __init__(self, dictionary: WordDictionary, ai_level: int) -> None:
+        self.session = dictionary.new_session()
+        self.ai_player = AiPlayer("computer", ai_level=float(ai_level))
+        self.word_start = choice("abcdefghijklmnopqrstuvwxyz")
+        self.first_word = True
+
+    def ai_play(self) -> str:
+        """ Get the computer word ('' if the computer gives up). """
+
+        word = self.ai_player.play(self.word_start,
+                                   self.session,
+                                   no_endgame_input=self.first_word,
+                                   sink=NullSink(),
+                                   interactive=False)
+        if word == "remove_player":
+            return ""
+        self.session.discard_word(word)
+        self.word_start = word[-2:]
+        self.first_word = False
+        return word
+
+
+class GameServer:
+    """ Serve games over a TCP or Unix socket. """
+
+    dictionary: WordDictionary
+    # Number of connected clients
+    clients: int
+
+    def __init__(self, dictionary: WordDictionary) -> None:
+        self.dictionary = dictionary
+        self.clients = 0
+
+    async def start(self,
+                    host: str = "127.0.0.1",
+                    port: int = 0,
+                    unix_path: str = ""
+                    ) -> asyncio.AbstractServer:
+        """ Start listening on 'unix_path' or on 'host':'port'. """
+
+        if unix_path:
+            return await asyncio.start_unix_server(
+                self.handle_client, unix_path, limit=MAX_LINE_LENGTH)
+        return await asyncio.start_server(
+            self.handle_client, host, port, limit=MAX_LINE_LENGTH)
+
+    async def handle_client(self,
+                            reader: asyncio.StreamReader,
+                            writer: asyncio.StreamWriter
+                            ) -> None:
+        """ Play the games of a connected client. """
+
+        self.clients += 1
+        game = None
+        try:
+            writer.write(b"READY\n")
+            while line := await reader.readline():
+                command, _, argument = line.decode().strip().partition(" ")
+                command = command.upper()
+                if command == "NEW":
+                    game, replies = await self.new_game(argument)
+                elif command == "QUIT" and game is None:
+                    break
+                elif game is None:
+                    replies = ["ERROR no game, send 'NEW <level>'"]
+                elif command == "WORD":
+                    game, replies = await self.play_word(
+                        game, argument.strip().lower())
+                elif command == "HINT":
+                    found = game.session.has_prefix(game.word_start)
+                    replies = ["HINT yes" if found else "HINT no"]
+                elif command == "QUIT":
+                    game, replies = None, ["LOSE"]
+                else:
+                    replies = [f"ERROR unknown command '{command}'"]
+                writer.write("".join(
+                    reply + "\n" for reply in replies).encode())
+                await writer.drain()
+        except (ConnectionError, ValueError):
+            # Client disconnected or sent a too long line
+            pass
+        finally:
+            self.clients -= 1
+            writer.close()
+
+    async def new_game(self,
+                       level: str
+                       ) -> tuple[ClientGame | None, list[str]]:
+        """ Start a game, the computer or the client moves first. """
+
+        if not level.strip().isdigit() or int(level) not in range(1, 11):
+            return None, [f"ERROR '{level}' is not in range of 1...10!"]
+        game = ClientGame(self.dictionary, int(level))
+        if choice((True, False)):
+            return await self.ai_turn(game)
+        return game, [f"TURN {game.word_start}"]
+
+    async def play_word(self,
+                        game: ClientGame,
+                        word: str
+                        ) -> tuple[ClientGame | None, list[str]]:
+        """ Play the client word and answer with the computer word. """
+
+        error = check_word(word, game.word_start, game.session,
+                           game.first_word)
+        if not error and not game.session.is_game_word(word):
+            error = f"'{word}' is not in the dictionary!"
+            if suggestions := game.session.suggest_words(
+                    word, game.word_start):
+                error += f" Did you mean: {', '.join(suggestions)}?"
+        if error:
+            return game, [f"ERROR {error}"]
+        game.session.discard_word(word)
+        game.word_start = word[-2:]
+        game.first_word = False
+        return await self.ai_turn(game)
+
+    async def ai_turn(self,
+                      game: ClientGame
+                      ) -> tuple[ClientGame | None, list[str]]:
+        """ Let the computer play without blocking the other clients. """
+
+        word = await asyncio.to_thread(game.ai_play)
+        if not word:
+            return None, ["AI qq", "WIN"]
+        if not game.session.has_prefix(game.word_start):
+            # The client can't answer
+            return None, [f"AI {word}", "LOSE"]
+        return game, [f"AI {word}", f"TURN {game.word_start}"]
+
+
+async def serve(dictionary: WordDictionary,
+                host: str = "127.0.0.1",
+                port: int = 0,
+                unix_path: str = ""
+                ) -> None:
+    """ Serve games until cancelled. """
+
+    server = await GameServer(dictionary).start(host, port, unix_path)
+    addresses = ", ".join(
+        str(socket.getsockname()) for socket in server.sockets)
+    print(f"... Serving games on {addresses} ...")
+    async with server:
+        await server.serve_forever()
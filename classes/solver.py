@@ -0,0 +1,312 @@
+""" Solver class module.
+
+Solve the game on the bigram graph: every bigram is a node and every
+game word is an edge from its start bigram to its end bigram.
+The player who must answer from a bigram without words loses.
+"""
+
+import threading
+from typing import TYPE_CHECKING
+
+from classes import metrics
+from classes.word_store import BIGRAMS, bigram_id
+
+if TYPE_CHECKING:
+    from classes.game_session import GameSession
+    from classes.word_dictionary import WordDictionary
+
+# Positions searched for a move before giving up
+SOLVER_MAX_NODES: int = 20_000
+# Moves searched ahead before giving up (the positions are keyed by
+# every played word, so deep positions are slow and never repeat)
+SOLVER_MAX_DEPTH: int = 200
+# Solved positions kept between moves (the memo is cleared when full)
+SOLVER_MEMO_SIZE: int = 500_000
+# Replies solved ahead for the most likely bigrams of the previous player
+SPECULATED_BIGRAMS: int = 10
+
+
+class _OutOfNodes(Exception):
+    """ The node budget of a move was used. """
+
+
+class Solver:
+    """ Label positions as won or lost for the player to move.
+
+    A position is the current bigram and the number of played words
+    of every (start, end) bigram pair. Positions are memoized, so the
+    positions solved for a move are reused by the next moves and by
+    other games with the same dictionary.
+
+    While the previous player thinks, the replies to their likely words
+    can be solved ahead in a background thread ('speculate').
+    """
+
+    dictionary: "WordDictionary"
+    max_nodes: int
+    __version: int
+    __memo: dict[tuple[int, frozenset[tuple[int, int]]], bool]
+    __successors: dict[int, list[int]]
+    __played: dict[int, int]
+    __played_starts: dict[int, int]
+    __nodes: int
+    __replies: dict[tuple[int, frozenset[tuple[int, int]]], int]
+    __speculation: threading.Thread | None
+    __stop: threading.Event
+
+    def __init__(self,
+                 dictionary: "WordDictionary",
+                 max_nodes: int = SOLVER_MAX_NODES
+                 ) -> None:
+        self.dictionary = dictionary
+        self.max_nodes = max_nodes
+        self.__version = dictionary.version
+        self.__memo = {}
+        self.__successors = {}
+        self.__replies = {}
+        self.__speculation = None
+        self.__stop = threading.Event()
+
+    # region: solve positions
+    def solve(self, session: "GameSession", bigram: int) -> bool | None:
+        """ Check if the player to move from the 'bigram' id wins.
+
+        None if the position can't be solved within 'max_nodes'.
+        """
+
+        self.stop_speculation()
+        self.__check_version()
+        self.__start(session.played_pairs)
+        try:
+            return self.__search(bigram)
+        except _OutOfNodes:
+            return None
+
+    def best_end(self, session: "GameSession", bigram: int) -> int:
+        """ Get the end bigram id of a winning move from the 'bigram' id.
+
+        -1 if there is no winning move or it can't be found
+        within 'max_nodes'.
+        """
+
+        self.stop_speculation()
+        self.__check_version()
+        played = session.played_pairs
+        reply = self.__replies.get((bigram, frozenset(played.items())))
+        if reply is not None:
+            metrics.count("speculation_hits")
+            return reply
+        self.__start(played)
+        try:
+            return self.__best_end(bigram)
+        except _OutOfNodes:
+            return -1
+
+    def best_word(self, session: "GameSession", word_start: str) -> str:
+        """ Get a winning word that starts with 'word_start' ('' if none
+        is found).
+        """
+
+        start = bigram_id(word_start)
+        if start < 0:
+            return ""
+        with metrics.timer("solver"):
+            end = self.best_end(session, start)
+        if end < 0:
+            return ""
+        return session.get_pair_word(start, end)
+    # endregion
+
+    # region: speculate
+    def speculate(self, session: "GameSession", bigram: int) -> None:
+        """ Solve the replies to the words the previous player can play
+        from the 'bigram' id in a background thread.
+
+        The most common word ends are solved first, until
+        'stop_speculation' is called. A reply is only used for the
+        position it was solved for, so discarding any other word
+        than the previous player's invalidates it.
+        """
+
+        self.stop_speculation()
+        self.__check_version()
+        self.__replies = {}
+        self.__stop.clear()
+        self.__speculation = threading.Thread(
+            target=self.__speculate, args=(session.played_pairs, bigram),
+            name="solver-speculation", daemon=True)
+        self.__speculation.start()
+
+    def stop_speculation(self) -> None:
+        """ Stop solving replies ahead and wait for the thread. """
+
+        if self.__speculation is not None:
+            self.__stop.set()
+            self.__speculation.join()
+            self.__speculation = None
+
+    def __speculate(self, played: dict[int, int], bigram: int) -> None:
+        """ Solve the replies after the likely words from 'bigram'. """
+
+        self.__start(played)
+        ends = [end for end in self.__moves(bigram)
+                if self.__start_count(end)]
+        # The ends of the most words are the most likely
+        ends.sort(key=lambda end: -self.__count(bigram, end))
+        for end in ends[:SPECULATED_BIGRAMS]:
+            position = dict(played)
+            pair = bigram * BIGRAMS + end
+            position[pair] = position.get(pair, 0) + 1
+            self.__start(position)
+            try:
+                reply = self.__best_end(end)
+            except _OutOfNodes:
+                if self.__stop.is_set():
+                    break
+                continue
+            self.__replies[(end, frozenset(position.items()))] = reply
+    # endregion
+
+    # region: search
+    def __check_version(self) -> None:
+        """ Forget the solved positions if the game words changed. """
+
+        if self.__version != self.dictionary.version:
+            self.__version = self.dictionary.version
+            self.__memo = {}
+            self.__successors = {}
+            self.__replies = {}
+
+    def __start(self, played: dict[int, int]) -> None:
+        """ Start a search from the 'played' (start, end) pair counts. """
+
+        if len(self.__memo) > SOLVER_MEMO_SIZE:
+            self.__memo = {}
+        self.__nodes = 0
+        self.__played = played
+        self.__played_starts = {}
+        for pair, count in self.__played.items():
+            start = pair // BIGRAMS
+            self.__played_starts[start] = (
+                self.__played_starts.get(start, 0) + count)
+
+    def __search(self, bigram: int) -> bool:
+        """ Check if the player to move from 'bigram' wins.
+
+        The positions are searched depth first with an explicit stack,
+        a game can be longer than the recursion limit.
+        """
+
+        # Positions being searched: bigram, memo key, moves left
+        # and the end of the move being searched (-1 if none)
+        stack: list[list] = []
+        # Result of the position after the move being searched
+        child = self.__enter(bigram, stack)
+        if child is not None:
+            return child
+        try:
+            while True:
+                frame = stack[-1]
+                start, key, moves, end = frame
+                won = None
+                if child is not None:
+                    self.__play(start, end, -1)
+                    frame[3] = -1
+                    # A move to a lost position wins
+                    if not child:
+                        won = True
+                    child = None
+                if won is None:
+                    end = next(moves, -1)
+                    if end >= 0:
+                        frame[3] = end
+                        self.__play(start, end, 1)
+                        child = self.__enter(end, stack)
+                        continue
+                    won = False
+                self.__memo[key] = won
+                stack.pop()
+                if not stack:
+                    return won
+                child = won
+        except BaseException:
+            # Take back the moves being searched
+            for start, _, _, end in stack:
+                if end >= 0:
+                    self.__play(start, end, -1)
+            raise
+
+    def __enter(self, bigram: int, stack: list[list]) -> bool | None:
+        """ Get the result of the position at 'bigram' if it is known
+        at once, otherwise push it on the search 'stack' (None).
+        """
+
+        key = (bigram, frozenset(self.__played.items()))
+        result = self.__memo.get(key)
+        if result is not None:
+            return result
+        self.__nodes += 1
+        if self.__nodes > self.max_nodes or self.__stop.is_set():
+            raise _OutOfNodes
+        moves = self.__moves(bigram)
+        # A word that ends with a bigram without words wins at once
+        if any(not self.__start_count(end) for end in moves):
+            self.__memo[key] = True
+            return True
+        if len(stack) >= SOLVER_MAX_DEPTH:
+            raise _OutOfNodes
+        stack.append([bigram, key, iter(moves), -1])
+        return None
+
+    def __best_end(self, bigram: int) -> int:
+        """ End bigram id of a winning move from 'bigram' (-1 if none).
+
+        Raise '_OutOfNodes' if it can't be found within 'max_nodes'.
+        """
+
+        for end in self.__moves(bigram):
+            if not self.__start_count(end):
+                return end
+        for end in self.__moves(bigram):
+            self.__play(bigram, end, 1)
+            try:
+                if not self.__search(end):
+                    return end
+            finally:
+                self.__play(bigram, end, -1)
+        return -1
+
+    def __moves(self, bigram: int) -> list[int]:
+        """ End bigrams of the words left to play from 'bigram'.
+
+        The ends with the fewest answers are tried first.
+        """
+
+        if bigram not in self.__successors:
+            self.__successors[bigram] = [
+                end for end, count in enumerate(
+                    self.dictionary.matrix.row(bigram))
+                if count]
+        moves = [end for end in self.__successors[bigram]
+                 if self.__count(bigram, end)]
+        moves.sort(key=self.__start_count)
+        return moves
+
+    def __count(self, start: int, end: int) -> int:
+        return (self.dictionary.matrix.count(start, end)
+                - self.__played.get(start * BIGRAMS + end, 0))
+
+    def __start_count(self, bigram: int) -> int:
+        return (self.dictionary.start_count(bigram)
+                - self.__played_starts.get(bigram, 0))
+
+    def __play(self, start: int, end: int, count: int) -> None:
+        """ Play (count 1) or take back (count -1) a word. """
+
+        pair = start * BIGRAMS + end
+        self.__played[pair] = self.__played.get(pair, 0) + count
+        if not self.__played[pair]:
+            del self.__played[pair]
+        self.__played_starts[start] = (
+            self.__played_starts.get(start, 0) + count)
+    # endregion
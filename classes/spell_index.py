@@ -0,0 +1,82 @@
+""" Spell Index class module.
+
+Find the game words close to a misspelled word with symmetric deletes:
+two words are at most 2 edits apart if deleting at most one letter
+from each gives the same text.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Iterator
+from zlib import crc32
+
+# Suggested words are at most this many edits away
+MAX_EDIT_DISTANCE: int = 2
+
+
+def deletes(word: str) -> Iterator[str]:
+    """ 'word' and the words with one letter deleted.
+
+    The first letter is kept, typos are expected after the word start.
+    """
+
+    yield word
+    for index in range(1, len(word)):
+        # Deleting either of two same letters gives the same word
+        if index == 1 or word[index] != word[index - 1]:
+            yield word[:index] + word[index + 1:]
+
+
+def edit_distance(first: str, second: str) -> int:
+    """ Number of inserted, deleted, replaced or swapped letters
+    between two words.
+    """
+
+    previous2 = []
+    previous = list(range(len(second) + 1))
+    for row, letter in enumerate(first, start=1):
+        current = [row]
+        for column, other in enumerate(second, start=1):
+            cost = letter != other
+            current.append(min(previous[column] + 1,
+                               current[column - 1] + 1,
+                               previous[column - 1] + cost))
+            if (row > 1 and column > 1 and letter == second[column - 2]
+                    and first[row - 2] == other):
+                # Swapped letters
+                current[column] = min(current[column],
+                                      previous2[column - 2] + 1)
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class SpellIndex:
+    """ Symmetric delete index of the game words.
+
+    The deletes aren't kept as strings: every delete is stored as its
+    crc32 hash with a word id, sorted by hash. Hash collisions only add
+    candidates, they are dropped by the edit distance check.
+    """
+
+    __hashes: array
+    __ids: array
+
+    def __init__(self, words: Iterable[str]) -> None:
+        """ Index the 'words', in word id order. """
+
+        keys = sorted(
+            crc32(delete.encode()) << 32 | word_id
+            for word_id, word in enumerate(words)
+            for delete in deletes(word))
+        self.__hashes = array("I", (key >> 32 for key in keys))
+        self.__ids = array("I", (key & 0xFFFFFFFF for key in keys))
+
+    def candidates(self, word: str) -> set[int]:
+        """ Ids of the words that may be close to 'word'. """
+
+        ids = set()
+        for delete in set(deletes(word)):
+            key = crc32(delete.encode())
+            ids.update(self.__ids[bisect_left(self.__hashes, key):
+                                  bisect_right(self.__hashes, key)])
+        return ids
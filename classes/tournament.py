@@ -0,0 +1,145 @@
+""" Tournament module.
+
+Play round-robin games between AI levels in a process pool
+and report win rates, Elo ratings, mean rounds and games per second.
+"""
+
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import combinations, islice
+
+from classes.events import NullSink
+from classes.game import Game
+from classes.player import AiPlayer
+from classes.word_dictionary import WordDictionary
+
+AI_LEVELS: tuple[int, ...] = tuple(range(1, 11))
+# Number of games sent at once to a worker process
+GAMES_PER_TASK: int = 50
+ELO_START: float = 1500.0
+ELO_K: float = 16.0
+
+# Dictionary loaded once by every worker process
+_dictionary: WordDictionary | None = None
+
+
+@dataclass
+class LevelStats:
+    """ Results of an AI level. """
+
+    games: int = 0
+    wins: int = 0
+    rounds: int = 0
+    elo: float = ELO_START
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.games if self.games else 0.0
+
+    @property
+    def mean_rounds(self) -> float:
+        return self.rounds / self.games if self.games else 0.0
+
+
+@dataclass
+class TournamentReport:
+    """ Tournament results. """
+
+    levels: dict[int, LevelStats] = field(default_factory=dict)
+    games: int = 0
+    seconds: float = 0.0
+
+    @property
+    def games_per_second(self) -> float:
+        return self.games / self.seconds if self.seconds else 0.0
+
+    def add_game(self, first: int, second: int, winner: int,
+                 rounds: int) -> None:
+        """ Add a game result and update the Elo ratings. """
+
+        self.games += 1
+        first_stats = self.levels.setdefault(first, LevelStats())
+        second_stats = self.levels.setdefault(second, LevelStats())
+        expected = 1 / (1 + 10 ** ((second_stats.elo - first_stats.elo) / 400))
+        score = 1.0 if winner == first else 0.0
+        first_stats.elo += ELO_K * (score - expected)
+        second_stats.elo -= ELO_K * (score - expected)
+        for level, stats in ((first, first_stats), (second, second_stats)):
+            stats.games += 1
+            stats.rounds += rounds
+            if winner == level:
+                stats.wins += 1
+
+    def summary(self) -> str:
+        """ Report table, one AI level per row. """
+
+        lines = [f"{'level':>5} {'games':>7} {'win rate':>8} "
+                 f"{'elo':>7} {'rounds':>6}"]
+        for level, stats in sorted(self.levels.items()):
+            lines.append(
+                f"{level:>5} {stats.games:>7} {stats.win_rate:>8.1%} "
+                f"{stats.elo:>7.1f} {stats.mean_rounds:>6.1f}")
+        lines.append(
+            f"{self.games} games in {self.seconds:.1f}s "
+            f"({self.games_per_second:.1f} games/s)")
+        return "\n".join(lines)
+
+
+def _init_worker(path: str) -> None:
+    """ Load the dictionary once per worker process. """
+
+    global _dictionary
+    # Forked workers start with the same random state
+    random.seed()
+    _dictionary = WordDictionary(path)
+
+
+def _play_games(
+        pairings: list[tuple[int, int]]
+        ) -> list[tuple[int, int, int, int]]:
+    """ Play a game for every (first level, second level) pairing.
+
+    Return (first level, second level, winner level, rounds) for each game.
+    """
+
+    game = Game(sink=NullSink(), interactive=False)
+    results = []
+    for first, second in pairings:
+        players = [AiPlayer(f"level {first} (1)", ai_level=float(first)),
+                   AiPlayer(f"level {second} (2)", ai_level=float(second))]
+        result = game.play(players, _dictionary)
+        winner = first if result.winner == players[0].name else second
+        results.append((first, second, winner, result.rounds))
+    return results
+
+
+def run_tournament(path: str,
+                   games: int,
+                   levels: tuple[int, ...] = AI_LEVELS,
+                   workers: int = 1
+                   ) -> TournamentReport:
+    """ Play 'games' games between every two AI 'levels'.
+
+    Every level starts half of its games.
+    """
+
+    pairings = []
+    for first, second in combinations(levels, 2):
+        for game_no in range(games):
+            pairings.append(
+                (first, second) if game_no % 2 == 0 else (second, first))
+    random.shuffle(pairings)
+    pairings_iter = iter(pairings)
+    tasks = iter(lambda: list(islice(pairings_iter, GAMES_PER_TASK)), [])
+
+    report = TournamentReport()
+    start = time.perf_counter()
+    with ProcessPoolExecutor(workers, initializer=_init_worker,
+                             initargs=(path,)) as pool:
+        for results in pool.map(_play_games, tasks):
+            for result in results:
+                report.add_game(*result)
+    report.seconds = time.perf_counter() - start
+    return report
@@ -1,267 +1,724 @@
 """ Word Dictionary class module. """
 
 import xml.etree.ElementTree as ET
+import hashlib
 import os
-import re
+import pickle
+import threading
 import time
+from array import array
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import BinaryIO, Iterable, Sequence
+
+from classes import metrics
+from classes.bigram_matrix import BigramMatrix
+from classes.game_session import GameSession
+from classes.opening_book import BOOK_SUFFIX, OpeningBook
+from classes.spell_index import SpellIndex
+from classes.word_filter import ROMANIAN, Language
+from classes.word_source import (TextSource, XmlSource, word_source,
+                                 write_atomic)
+from classes.word_store import WordStore, get_bit, new_bitset, set_bit
+from classes.word_trie import WordTrie
+
+# Compiled dictionary file is saved next to the xml file
+CACHE_SUFFIX: str = ".cache"
+# Increase when the compiled dictionary content changes
+CACHE_VERSION: int = 12
+# Added and removed words are appended to the journal file next to the
+# xml file until they are compacted into the xml file
+JOURNAL_SUFFIX: str = ".journal"
+# Bytes read at once when looking for the last complete journal line
+JOURNAL_READ_SIZE: int = 4096
+# Number of xml entries filtered at once when building the dictionary
+BUILD_CHUNK_SIZE: int = 10_000
+# Word store classes by backend name
+BACKENDS: dict[str, type[WordStore | WordTrie]] = {
+    "store": WordStore,
+    "trie": WordTrie,
+    }
+
+# Appends the saved changes to the journal files, one write at a time.
+# The thread is joined at exit, so queued writes finish before exiting.
+_journal_writer = ThreadPoolExecutor(
+    1, thread_name_prefix="journal-writer")
+# Last queued write of every journal file
+_journal_writes: dict[str, Future] = {}
+
+
+def _wait_for_journal(path: str) -> None:
+    """ Wait for the queued writes to the journal file 'path'. """
+
+    write = _journal_writes.get(path)
+    if write is not None:
+        write.result()
+
+
+def _journal_key(journal: bytes) -> tuple[int, str]:
+    """ Identify the journal lines by size and hash. """
+
+    return len(journal), hashlib.sha256(journal).hexdigest()
+
+
+def _cut_torn_line(file: BinaryIO) -> None:
+    """ Cut an incomplete last line (interrupted write) off the journal
+    'file', so the next change isn't appended to it.
+    """
+
+    size = file.seek(0, os.SEEK_END)
+    end = size
+    while end > 0:
+        start = max(0, end - JOURNAL_READ_SIZE)
+        file.seek(start)
+        chunk = file.read(end - start)
+        if (index := chunk.rfind(b"\n")) >= 0:
+            if start + index + 1 < size:
+                file.truncate(start + index + 1)
+            return
+        end = start
+    file.truncate(0)
+
+
+def _filter_entries(
+        language: Language,
+        entries: list[tuple[int, str]]
+        ) -> tuple[list[tuple[str, int]], int]:
+    """ Filter the 'language' game words from a chunk of entries.
+
+    Return the words with their entry 'id' and the last entry 'id'.
+    """
+
+    words = []
+    entry_ids = [entry_id for entry_id, _ in entries]
+    descriptions = [description for _, description in entries]
+    for entry_id, entry_words in zip(
+            entry_ids, language.filter_descriptions(descriptions)):
+        words.extend((word, entry_id) for word in entry_words)
+    last_id = max(entry_ids, default=0)
+    return words, last_id
 
 
 class WordDictionary:
-    """ A dictionary of words used in the game. """
+    """ A dictionary of words used in the game.
+
+    The game words are kept in a compact 'WordStore' (or 'WordTrie')
+    and referred to by their word id. Removed words stay in the store
+    and are marked in a bitset, so removing a word doesn't rebuild
+    the store.
+
+    The words are read from a 'WordSource' (the DEXOnline xml file or
+    a word list) and filtered with the rules of a 'Language'.
+    """
 
     __path: str
-    __tree: ET
-    __root: ET.Element
-    words: set[str]
-    __words_start: set[str]
-    __words_end: set[str]
-    endgame_words: set[str]
-    __words_to_add: bool
+    __cache_path: str
+    __journal_path: str
+    source: XmlSource | TextSource
+    language: Language
+    __tree: ET.ElementTree
+    __root: ET.Element | None
+    __entries: dict[int, ET.Element]
+    backend: str
+    store: WordStore | WordTrie
+    __removed: bytearray
+    matrix: BigramMatrix
+    spell_index: SpellIndex
+    __entry_ids: array
+    __extra_entries: dict[int, list[int]]
+    __last_id: int
+    __words_to_add: list[tuple[str, str]]
     __words_to_remove: list[str]
-    played_words: set[str]
-
-    def __init__(self, path: str) -> None:
+    # Last journal change of every normalized word: the word as added
+    # and its timestamp, None for a remove
+    __journal_changes: dict[str, tuple[str, str] | None]
+    __unsaved_lines: list[str]
+    __save_queued: bool
+    __save_lock: threading.Lock
+    __book: OpeningBook | None
+    # Changes every time the game words change
+    version: int
+
+    def __init__(self,
+                 path: str,
+                 use_cache: bool = True,
+                 backend: str = "store",
+                 language: Language = ROMANIAN
+                 ) -> None:
         """ Create a dictionary with filtered words imported from file path.
 
         Path - 'path' to the input file including filename and extension
+        use_cache - load the compiled dictionary saved next to the input file
+        if it matches the input file, otherwise build and save it
+        backend - word store, 'store' (sorted words) or 'trie'
+        language - rules that turn the entries into game words
+        An '.xml' file is read as a DEXOnline xml file, any other file
+        as a word list with one word per line ('.gz' if compressed).
+        Changes from the journal file are replayed after loading.
+        The opening book is loaded (or built) with the compiled dictionary.
         """
 
         self.__path = path
-        self.words = set()
-        self.__words_start = set()
-        self.__words_end = set()
-        self.__words_to_add = False
+        self.__cache_path = path + CACHE_SUFFIX if use_cache else ""
+        self.__journal_path = path + JOURNAL_SUFFIX
+        self.source = word_source(path)
+        self.language = language
+        if backend not in BACKENDS:
+            raise ValueError(f"Invalid backend: '{backend}'")
+        self.backend = backend
+        self.__root = None
+        self.__last_id = 0
+        self.__words_to_add = []
         self.__words_to_remove = []
-        self.played_words = set()
-        self.__parse_xml(self.__path)
-        self.__build_dictionary()
+        self.__journal_changes = {}
+        self.__unsaved_lines = []
+        self.__save_queued = False
+        self.__save_lock = threading.Lock()
+        self.__book = None
+        self.version = 0
+        journal = self.__read_journal()
+        with metrics.timer("load_cache"):
+            loaded = self.__load_cache(journal)
+        if not loaded:
+            self.__build_dictionary()
+        with metrics.timer("replay_journal"):
+            added, removed = self.__replay_journal(journal)
+        # The words added by the journal are saved with the store, so
+        # the store isn't rebuilt on the next load. The removed words
+        # are only marked, after saving.
+        if not loaded or added:
+            with metrics.timer("save_cache"):
+                self.__save_cache(journal)
+        for word in removed:
+            self.__discard_game_word(word)
+        with metrics.timer("load_book"):
+            self.__load_book()
 
     # region: xml related methods
-    def __parse_xml(self, path: str) -> None:
-        """ Parse the xml file. """
+    def __xml_root(self) -> ET.Element:
+        """ Get the xml root, parsing the whole xml file if needed.
+
+        The xml tree is only loaded to write changes to the xml file.
+        """
 
-        print("... Loading xml file ...")
-        self.__tree = ET.parse(path)
-        self.__root = self.__tree.getroot()
+        if self.__root is None:
+            print("... Loading xml file for editing ...")
+            with metrics.timer("parse_xml"):
+                self.__tree = ET.parse(self.__path)
+            self.__root = self.__tree.getroot()
+            self.__entries = {
+                int(entry.attrib["id"]): entry for entry in self.__root}
+        return self.__root
 
     def save_xml(self):
-        """ Write changes to xml file. """
+        """ Write changes to the journal file in the background.
+
+        Changes saved while a write is queued are written with it.
+        The xml file isn't rewritten, see 'compact_xml'.
+        """
 
         if self.__words_to_remove or self.__words_to_add:
-            if self.__words_to_remove:
-                self.remove_words(*self.__words_to_remove)
-            print("... Saving dictionary to file ...")
+            print("... Saving dictionary changes ...")
+            lines = [f"add\t{word}\t{timestamp}\n"
+                     for word, timestamp in self.__words_to_add]
+            lines += [f"remove\t{word}\n" for word in self.__words_to_remove]
+            with self.__save_lock:
+                self.__unsaved_lines += lines
+                if not self.__save_queued:
+                    self.__save_queued = True
+                    _journal_writes[self.__journal_path] = (
+                        _journal_writer.submit(self.__write_journal))
+            # Same order as the journal lines
+            for word, timestamp in self.__words_to_add:
+                self.__journal_change(word, (word, timestamp))
+            for word in self.__words_to_remove:
+                self.__journal_change(word, None)
+            self.__words_to_add = []
+            self.__words_to_remove = []
+
+    def flush(self) -> None:
+        """ Wait until the saved changes are written to the journal file.
+
+        Raise the error of a failed write.
+        """
+
+        _wait_for_journal(self.__journal_path)
+
+    def __write_journal(self) -> None:
+        """ Append the saved changes to the journal file. """
+
+        with self.__save_lock:
+            lines = self.__unsaved_lines
+            self.__unsaved_lines = []
+            self.__save_queued = False
+        try:
+            with (metrics.timer("save_xml"),
+                  open(self.__journal_path, "ab+") as file):
+                _cut_torn_line(file)
+                file.write("".join(lines).encode())
+                file.flush()
+                os.fsync(file.fileno())
+        except OSError as err:
+            print(f"... Couldn't save dictionary changes: {err} ...")
+            raise
+
+    def compact_xml(self):
+        """ Fold the journal changes into the dictionary file. """
+
+        self.save_xml()
+        self.flush()
+        if not self.__journal_changes:
+            return
+
+        print("... Saving dictionary to file ...")
+        if isinstance(self.source, TextSource):
+            # Word lists have no entries to rename, removed words
+            # are dropped from the list
+            with metrics.timer("compact_xml"):
+                self.source.rewrite(
+                    [change[0] for change in self.__journal_changes.values()
+                     if change is not None],
+                    {word for word, change in self.__journal_changes.items()
+                     if change is None},
+                    self.language)
+        else:
+            self.__compact_entries()
+        self.__invalidate_cache()
+        os.remove(self.__journal_path)
+        self.__journal_changes = {}
+
+    def __compact_entries(self) -> None:
+        """ Add and rename the xml entries of the journal changes
+        and rewrite the xml file.
+
+        Only the last change of a word is applied: a word removed and
+        added again keeps its entries.
+        """
+
+        root = self.__xml_root()
+        for word, change in self.__journal_changes.items():
+            word_id = self.store.word_id(word)
+            if change is None:
+                if word_id >= 0:
+                    for entry_id in self.__pop_entries(word_id):
+                        self.__rename_word(entry_id, word)
+                continue
+            if word_id >= 0 and self.__entry_ids[word_id]:
+                # The word still has its entries
+                continue
+            description, timestamp = change
+            # Build new element
+            self.__last_id += 1
+            new_entry = ET.Element("Entry", {"id": str(self.__last_id)})
+            entry_timestamp = ET.SubElement(new_entry, "Timestamp")
+            entry_timestamp.text = timestamp
+            entry_description = ET.SubElement(new_entry, "Description")
+            entry_description.text = description + " (added by fazan)"
+            if word_id >= 0:
+                self.__add_entry(word_id, self.__last_id)
+
+            # Add new element to tree
+            root.append(new_entry)
+            self.__entries[self.__last_id] = new_entry
+
+        with metrics.timer("compact_xml"):
             # Re-format the xml file
-            ET.indent(self.__root)
-            self.__tree.write(self.__path, "UTF-8", True)
-    # endregion
+            ET.indent(root)
+            write_atomic(self.__path, lambda file: self.__tree.write(
+                file, "UTF-8", True))
+        # Free the xml tree
+        self.__root = None
 
-    # region: build game dictionaries
-    def __build_dictionary(self, words_to_remove: tuple = ()) -> None:
-        """ Build a game word dictionary.
+    def __read_journal(self) -> bytes:
+        """ Read the complete lines of the journal file.
 
-        Build a filtered set of game words and a set of words
-        that can end the game.
-        Also used for ~removing word(s).
+        An incomplete last line (interrupted write) is ignored.
         """
 
-        if words_to_remove:
-            print('... Rebuilding dictionary ...')
-        else:
-            print('... Building dictionary ...')
+        _wait_for_journal(self.__journal_path)
+        if not os.path.exists(self.__journal_path):
+            return b""
+        with open(self.__journal_path, "rb") as file:
+            journal = file.read()
+        return journal[:journal.rfind(b"\n") + 1]
+
+    def __replay_journal(self,
+                         journal: bytes
+                         ) -> tuple[list[str], set[str]]:
+        """ Add the words saved in the 'journal' lines to the store.
 
-        # Use 'range' to get the 'index' for ~removing word(s)
-        xml_len = len(self.__root)
-        for index in range(xml_len):
+        Return the words added to the store and the removed words.
+        """
 
-            if index == int(xml_len / 2):
-                print("... Halfway there ...")
+        if not journal:
+            return [], set()
+        print("... Replaying dictionary changes ...")
+        for line in journal.decode("utf-8").splitlines():
+            change = line.split("\t")
+            if change[0] == "add" and len(change) == 3:
+                self.__journal_change(change[1], (change[1], change[2]))
+            elif change[0] == "remove" and len(change) == 2:
+                self.__journal_change(change[1], None)
+        # The store is rebuilt once with all the added words
+        new_words = [word for word, change in self.__journal_changes.items()
+                     if change is not None
+                     and self.language.is_game_word(word)
+                     and word not in self.store]
+        if new_words:
+            self.__extend_store(new_words)
+        removed = {word for word, change in self.__journal_changes.items()
+                   if change is None}
+        return new_words, removed
+
+    def __journal_change(self,
+                         word: str,
+                         change: tuple[str, str] | None
+                         ) -> None:
+        """ Remember the last change of a word, by its game word
+        (the letters are replaced like in the dictionary file).
+        """
 
-            # Not with 'lower()' method to auto-exclude names
-            current_word: str = self.__root[index][1].text
+        self.__journal_changes[self.language.normalize(word)] = change
+    # endregion
 
-            # Strip of '(...)' using regex
-            current_word = re.sub(
-                pattern=r" \(.+?\)",
-                repl="",
-                string=current_word
-                )
+    # region: compiled dictionary cache
+    def __xml_key(self) -> tuple[int, int, str]:
+        """ Identify the xml file by size, modification time and hash. """
 
-            # Pre-check length
-            if len(current_word) < 3:
-                continue
+        stat = os.stat(self.__path)
+        file_hash = hashlib.sha256()
+        with open(self.__path, "rb") as file:
+            while chunk := file.read(1 << 20):
+                file_hash.update(chunk)
+        return stat.st_size, stat.st_mtime_ns, file_hash.hexdigest()
+
+    def __load_cache(self, journal: bytes) -> bool:
+        """ Load the compiled dictionary if it matches the xml file
+        and the 'journal' lines start with the lines saved with it.
+        """
 
-            current_word = self.__replace_diacritics(current_word)
-
-            # Check for word variations
-            for word_variation in current_word.split(" / "):
-                if self.__word_check(word_variation):
-                    if word_variation in words_to_remove:
-                        self.__rename_word(index, word_variation)
-                    else:
-                        self.words.add(word_variation)
-                        self.__words_start.add(word_variation[:2])
-                        self.__words_end.add(word_variation[-2:])
-
-        self.__build_endgame_words()
-
-    def __replace_diacritics(self, word: str) -> str:
-        """ Replace diacritics with 'normalized' characters. """
-
-        diacritics = {
-                "ă": "a",
-                "â": "a",
-                "î": "i",
-                "ș": "s",
-                "ț": "t"
+        if not self.__cache_path or not os.path.exists(self.__cache_path):
+            return False
+        try:
+            with open(self.__cache_path, "rb") as file:
+                cache = pickle.load(file)
+            if (cache["version"] != CACHE_VERSION or
+                    cache["backend"] != self.backend or
+                    cache["language"] != self.language.key or
+                    cache["key"] != self.__xml_key()):
+                return False
+            journal_size, _ = cache["journal"]
+            if cache["journal"] != _journal_key(journal[:journal_size]):
+                return False
+        # A corrupt cache is rebuilt
+        except Exception:
+            return False
+
+        print("... Loading compiled dictionary ...")
+        self.store = cache["store"]
+        self.__entry_ids = cache["entry_ids"]
+        self.__extra_entries = cache["extra_entries"]
+        self.__last_id = cache["last_id"]
+        self.__removed = new_bitset(len(self.store))
+        self.matrix = cache["matrix"]
+        self.spell_index = cache["spell_index"]
+        return True
+
+    def __save_cache(self, journal: bytes) -> None:
+        """ Save the compiled dictionary next to the xml file,
+        with the words added by the 'journal' lines.
+        """
+
+        if not self.__cache_path:
+            return
+        cache = {
+            "version": CACHE_VERSION,
+            "key": self.__xml_key(),
+            "backend": self.backend,
+            "language": self.language.key,
+            "journal": _journal_key(journal),
+            "store": self.store,
+            "entry_ids": self.__entry_ids,
+            "extra_entries": self.__extra_entries,
+            "last_id": self.__last_id,
+            "matrix": self.matrix,
+            "spell_index": self.spell_index,
             }
-        for diacritic, replacement in diacritics.items():
-            if diacritic in word:
-                word = word.replace(diacritic, replacement)
-        return word
+        try:
+            write_atomic(self.__cache_path, lambda file: pickle.dump(
+                cache, file, pickle.HIGHEST_PROTOCOL))
+        except OSError as err:
+            print(f"... Couldn't save compiled dictionary: {err} ...")
 
-    def __word_check(self, word: str) -> bool:
-        """ Check if a word is ok to be inserted in dictionary. """
+    def __invalidate_cache(self) -> None:
+        """ Delete the compiled dictionary after the xml file changed. """
 
-        # Re-check length in case is a variation
-        if len(word) < 3:
-            return False
+        if self.__cache_path and os.path.exists(self.__cache_path):
+            os.remove(self.__cache_path)
+    # endregion
 
-        # Check if word characters are in the alphabet
-        # Also check and exclude if the word contains big letters (name...)
-        accepted_chars = set("abcdefghijklmnopqrstuvwxyz")
-        for char in word:
-            if char not in accepted_chars:
-                return False
+    # region: build game dictionaries
+    def __build_dictionary(self) -> None:
+        """ Build a game word dictionary.
+
+        Build a store of filtered game words and count the words
+        that can end the game.
+        Remember the xml entries of every word for ~removing word(s).
+        """
+
+        print('... Building dictionary ...')
+
+        entries = self.source.entries()
+        chunks = iter(lambda: list(islice(entries, BUILD_CHUNK_SIZE)), [])
+        filter_entries = partial(_filter_entries, self.language)
+        with metrics.timer("build", phase="parse_filter"):
+            word_entries = self.__merge_chunks(map(filter_entries, chunks))
+
+        self.__build_store(word_entries)
+
+    def __merge_chunks(
+            self,
+            chunks: Iterable[tuple[list[tuple[str, int]], int]]
+            ) -> dict[str, Sequence[int]]:
+        """ Get the xml entries of the filtered words of every chunk. """
+
+        # Word list entries are never renamed, only the words are kept
+        keep_entries = isinstance(self.source, XmlSource)
+        word_entries = {}
+        for words, last_id in chunks:
+            self.__last_id = max(self.__last_id, last_id)
+            for word, entry_id in words:
+                if keep_entries:
+                    word_entries.setdefault(word, []).append(entry_id)
+                else:
+                    word_entries[word] = ()
+        return word_entries
+
+    def __build_store(self,
+                      word_entries: dict[str, Sequence[int]]
+                      ) -> None:
+        """ Store the words of 'word_entries' and count the endgame words.
+
+        Most words have one xml entry, it is kept in an array.
+        """
+
+        with metrics.timer("build", phase="store"):
+            self.store = BACKENDS[self.backend](word_entries)
+            self.__removed = new_bitset(len(self.store))
+            self.__entry_ids = array("I", bytes(4 * len(self.store)))
+            self.__extra_entries = {}
+            # Word ids follow the sorted words
+            for word_id, word in enumerate(sorted(word_entries)):
+                for entry_id in word_entries[word]:
+                    self.__add_entry(word_id, entry_id)
+        with metrics.timer("build", phase="endgame_words"):
+            self.matrix = BigramMatrix(self.store.starts, self.store.ends)
+        with metrics.timer("build", phase="spell_index"):
+            self.spell_index = SpellIndex(sorted(word_entries))
+
+    def __extend_store(self, words: list[str]) -> None:
+        """ Rebuild the store with the new 'words'. """
+
+        word_entries = {word: self.__pop_entries(word_id)
+                        for word_id, word in enumerate(self.store)}
+        for word in words:
+            word_entries.setdefault(word, [])
+        self.version += 1
+        self.__build_store(word_entries)
+
+    def __add_entry(self, word_id: int, entry_id: int) -> None:
+        """ Remember an xml entry of a word. """
+
+        if not self.__entry_ids[word_id]:
+            self.__entry_ids[word_id] = entry_id
         else:
-            return True
+            self.__extra_entries.setdefault(word_id, []).append(entry_id)
 
-    def __build_endgame_words(self) -> None:
-        """ Create a set of words that can end the game. """
+    def __pop_entries(self, word_id: int) -> list[int]:
+        """ Forget and return the xml entries of a word. """
 
-        self.endgame_words = {
-            word for word in self.words
-            if word[-2:] in self.__words_end.difference(self.__words_start)}
+        if not self.__entry_ids[word_id]:
+            return []
+        entries = [self.__entry_ids[word_id]]
+        entries += self.__extra_entries.pop(word_id, [])
+        self.__entry_ids[word_id] = 0
+        return entries
     # endregion
 
     # region: add/remove words
     def add_words(self, *words: tuple[str]) -> None:
-        """ Add new word(s) to dictionary. """
-
-        # Add word(s) to game
-        for word in words:
-            self.played_words.add(word)
+        """ Add new word(s) to dictionary.
 
-        # Find the last element 'id'
-        last_id = int(self.__root[len(self.__root) - 1].attrib["id"])
+        The xml entries are created when the xml file is saved.
+        """
 
         timestamp = str(int(time.time()))
 
         for word in words:
-            # Build new element
-            new_entry = ET.Element("Entry", {"id": str(last_id + 1)})
-            entry_timestamp = ET.SubElement(new_entry, "Timestamp")
-            entry_timestamp.text = timestamp
-            entry_description = ET.SubElement(new_entry, "Description")
-            entry_description.text = word + " (added by fazan)"
-            last_id += 1
-
-            self.__words_to_add = True
-
-            # Add new element to tree
             print(f"... Adding '{word}' to dictionary ...")
-            self.__root.append(new_entry)
+            self.__words_to_add.append((word, timestamp))
 
     def remove_words(self, *words) -> None:
-        """ Pseudo-removes the 'word(s)' and rebuild the dictionary. """
+        """ Pseudo-removes the 'word(s)' from the game words.
+
+        The xml entries are renamed when the journal is compacted.
+        """
 
         for word in words:
             print(f"... Removing '{word}' ...")
-        self.__build_dictionary(words_to_remove=words)
+            with metrics.timer("remove_word"):
+                self.__discard_game_word(word)
+            self.__words_to_remove.append(word)
+        metrics.count("words_removed", len(words))
 
-    def __rename_word(self, index: int, word_to_remove: str) -> None:
+    def __rename_word(self, entry_id: int, word_to_remove: str) -> None:
         """ Pseudo-removes the 'word_to_remove' from dictionary
         by renaming it with '__' prefix.
 
         Preserve the initial description with diacritics and parenthesis.
         """
 
-        word_split = self.__root[index][1].text.split(" / ")
+        description = self.__entries[entry_id][1]
+        word_split = description.text.split(" / ")
         for pos, word in enumerate(word_split):
-            word_parsed = re.sub(
-                pattern=r" \(.+?\)",
-                repl="",
-                string=word
-                )
-            word_parsed = self.__replace_diacritics(word_parsed)
+            word_parsed = self.language.normalize(word)
             if word_parsed == word_to_remove:
                 word_split[pos] = "__" + word
         else:
-            self.__root[index][1].text = " / ".join(
+            description.text = " / ".join(
                 [str(word) for word in word_split]
                 )
 
-    def discard_word(self, word: str, remove: bool = False):
-        """ Remove a word from current game. """
+    def __discard_game_word(self, word: str) -> None:
+        """ Remove a word from the game words and update endgame words.
 
-        self.played_words.add(word)
-        self.words.discard(word)
-        self.endgame_words.discard(word)
-        if remove:
-            self.__words_to_remove.append(word)
-            print(f"... Removed '{word}' from game ...")
+        When the last word that starts with a bigram is gone, the words
+        that end with that bigram become endgame words.
+        """
+
+        word_id = self.word_id(word)
+        if word_id < 0:
+            return
+        self.version += 1
+        set_bit(self.__removed, word_id)
+        if isinstance(self.store, WordTrie):
+            self.store.discard(word_id)
+        self.matrix.discard(self.store.starts[word_id],
+                            self.store.ends[word_id])
     # endregion
 
-    # region: get game words
-    def get_word(self,
-                 word_start: str,
-                 no_endgame: bool = True,
-                 smart_ai: bool = False
-                 ) -> str:
-        """Get a random word from dictionary that starts with 'word_start'."""
-
-        # All the words that start with 'word_start'
-        words = {word for word in self.words if word.startswith(word_start)}
-        # Words with endings which doesn't remove next player
-        not_endgame_words = words.difference(self.endgame_words)
-        # Words with endings which removes next player
-        endgame_words = words.intersection(self.endgame_words)
-        # Words with endings which doesn't remove next player,
-        # but also leaves no endgame words to him
-        if smart_ai:
-            found_word = False
-            for not_endgame_word in not_endgame_words:
-                if found_word is True:
-                    break
-                for endgame_word in self.endgame_words:
-                    if not_endgame_word[-2:] == endgame_word[:2]:
-                        break
-                else:
-                    smart_ai_word = not_endgame_word
-                    break
-            else:
-                smart_ai_word = ""
-
-        if words:
-            if no_endgame:
-                # Try to get a word that doesn't end the game
-                if smart_ai and smart_ai_word:
-                    return smart_ai_word
-                if not_endgame_words:
-                    return not_endgame_words.pop()
-                else:
-                    return words.pop()
-            else:
-                # Try to get a word that ends the game
-                if endgame_words:
-                    return endgame_words.pop()
-                else:
-                    if smart_ai and smart_ai_word:
-                        return smart_ai_word
-                    else:
-                        return words.pop()
-        else:
-            return ""
+    # region: game words
+    @property
+    def words(self) -> set[str]:
+        """ Set of the game words.
+
+        Built on every call, use 'word_id' to look up a word.
+        """
+
+        return {self.store[word_id] for word_id in range(len(self.store))
+                if not get_bit(self.__removed, word_id)}
+
+    @property
+    def endgame_words(self) -> set[str]:
+        """ Set of the words that can end the game.
+
+        Built on every call, use 'is_endgame_id' to check a word.
+        """
+
+        return {self.store[word_id] for word_id in range(len(self.store))
+                if not get_bit(self.__removed, word_id)
+                and self.is_endgame_id(word_id)}
+
+    def word_id(self, word: str) -> int:
+        """ Get the id of a game word (-1 if it isn't a game word). """
+
+        word_id = self.store.word_id(word)
+        if word_id < 0 or get_bit(self.__removed, word_id):
+            return -1
+        return word_id
+
+    def is_removed(self, word_id: int) -> bool:
+        """ Check if the word with 'word_id' was removed. """
+
+        return get_bit(self.__removed, word_id)
+
+    def is_endgame_id(self, word_id: int) -> bool:
+        """ Check if no game word starts with the end of a word. """
+
+        return not self.matrix.start_counts[self.store.ends[word_id]]
+    # endregion
+
+    # region: game sessions
+    def new_session(self) -> GameSession:
+        """ Start a game with the words of this dictionary. """
+
+        return GameSession(self)
+
+    def prefix_ids(self, word_start: str) -> range:
+        """ Get the ids of the words that start with 'word_start'.
+
+        Removed words are included, see 'is_removed'.
+        """
+
+        return self.store.prefix_ids(word_start)
+
+    def prefix_words(self, word_start: str) -> list[str]:
+        """ Get the game words that start with 'word_start'. """
+
+        return [self.store[word_id]
+                for word_id in self.store.prefix_ids(word_start)
+                if not get_bit(self.__removed, word_id)]
+
+    def start_count(self, bigram: int) -> int:
+        """ Number of game words that start with the 'bigram' id. """
+
+        return self.matrix.start_counts[bigram]
+
+    def endgame_start_count(self, bigram: int) -> int:
+        """ Number of endgame words that start with the 'bigram' id. """
+
+        return self.matrix.endgame_starts[bigram]
+
+    def opening_book(self) -> OpeningBook | None:
+        """ Get the opening book of the game words loaded from file
+        (None if there is none, see '__load_book').
+
+        The book isn't rebuilt when words are removed, its openings
+        are checked against the session when they are played.
+        """
+
+        return self.__book
+
+    def __load_book(self) -> None:
+        """ Load the opening book saved next to the xml file, or build
+        and save it if the game words changed.
+
+        The book is only kept with the compiled dictionary. If it can't
+        be built, the smart levels open like the other levels.
+        """
+
+        if not self.__cache_path:
+            return
+        fingerprint = self.fingerprint()
+        book_path = self.__path + BOOK_SUFFIX
+        self.__book = OpeningBook.load(book_path, fingerprint)
+        if self.__book is not None:
+            return
+        try:
+            with metrics.timer("build", phase="opening_book"):
+                self.__book = OpeningBook.build(self)
+        except Exception as err:
+            print(f"... Couldn't build opening book: {err} ...")
+            return
+        self.__book.save(book_path)
+
+    def fingerprint(self) -> str:
+        """ Hash of the game words, changes when the game words change. """
+
+        words_hash = hashlib.sha256("\n".join(self.store).encode())
+        words_hash.update(self.__removed)
+        return words_hash.hexdigest()
     # endregion
 
     # region: testing
@@ -299,10 +756,11 @@ class WordDictionary:
         Only used for testing.
         """
 
+        root = self.__xml_root()
         words_unfiltered = {
-            self.__root[index][1].text.lower()
-            for index in range(len(self.__root))
-            if len(self.__root[index][1].text) > 2
+            root[index][1].text.lower()
+            for index in range(len(root))
+            if len(root[index][1].text) > 2
             }
         return words_unfiltered
     # endregion
@@ -0,0 +1,169 @@
+""" Word filter module.
+
+Turn raw dictionary descriptions into game words.
+Descriptions are normalized in batches: the annotations and diacritics
+of a whole batch are replaced at once.
+The rules of every dictionary language are kept in a 'Language',
+the module functions use the romanian rules.
+"""
+
+import re
+from typing import Iterable, Sequence
+
+from classes.word_store import ALPHABET
+
+# Strip of '(...)' annotations
+ANNOTATION_PATTERN: str = r" \(.+?\)"
+# Replace diacritics with 'normalized' characters
+DIACRITICS: dict[str, str] = {
+    "ă": "a",
+    "â": "a",
+    "î": "i",
+    "ș": "s",
+    "ț": "t",
+    }
+# Separator of the word variations in a description
+VARIATION_SEPARATOR: str = " / "
+MIN_WORD_LENGTH: int = 3
+# Every game word starts and ends with a bigram
+SHORTEST_WORD_LENGTH: int = 2
+
+
+class Language:
+    """ Rules that turn the descriptions of a dictionary into game words.
+
+    The bigram ids use the 'ALPHABET' letters, so the letters of
+    a language are replaced with 'ALPHABET' letters and the game words
+    of a language can only use some of the 'ALPHABET' letters.
+    """
+
+    name: str
+    alphabet: str
+    variation_separator: str
+    min_word_length: int
+    # Identifies the rules, the compiled dictionary is kept for one key
+    key: tuple
+    __table: dict[int, str]
+    __annotation: re.Pattern | None
+    __excluded: re.Pattern | None
+
+    def __init__(self,
+                 name: str,
+                 alphabet: str = ALPHABET,
+                 replacements: dict[str, str] | None = None,
+                 annotation_pattern: str = "",
+                 variation_separator: str = "",
+                 min_word_length: int = MIN_WORD_LENGTH
+                 ) -> None:
+        """ Create the rules of a language.
+
+        alphabet - letters of the game words, some of the 'ALPHABET'
+        replacements - letters replaced before the words are checked
+        annotation_pattern - regex of the text removed from descriptions
+        (mustn't match new lines)
+        variation_separator - separator of the words of a description
+        ('' if every description is one word)
+        min_word_length - shortest game word, at least
+        'SHORTEST_WORD_LENGTH' letters
+        """
+
+        if not alphabet or not set(alphabet) <= set(ALPHABET):
+            raise ValueError(
+                f"Invalid alphabet: '{alphabet}', expected letters "
+                f"from '{ALPHABET}'")
+        if min_word_length < SHORTEST_WORD_LENGTH:
+            raise ValueError(
+                f"Invalid min_word_length: {min_word_length}, expected "
+                f"at least {SHORTEST_WORD_LENGTH} letters")
+        self.name = name
+        self.alphabet = alphabet
+        self.variation_separator = variation_separator
+        self.min_word_length = min_word_length
+        replacements = replacements or {}
+        self.key = (name, alphabet, tuple(sorted(replacements.items())),
+                    annotation_pattern, variation_separator, min_word_length)
+        self.__table = str.maketrans(replacements)
+        self.__annotation = (
+            re.compile(annotation_pattern) if annotation_pattern else None)
+        excluded = "".join(
+            letter for letter in ALPHABET if letter not in alphabet)
+        self.__excluded = re.compile(f"[{excluded}]") if excluded else None
+
+    def normalize(self, text: str) -> str:
+        """ Strip the annotations and replace the letters of 'text'. """
+
+        if self.__annotation is not None:
+            text = self.__annotation.sub("", text)
+        return text.translate(self.__table)
+
+    def is_game_word(self, word: str) -> bool:
+        """ Check if a word is ok to be inserted in dictionary.
+
+        Only words with small letters from the alphabet are accepted
+        (excludes names).
+        """
+
+        return (len(word) >= self.min_word_length and word.isascii()
+                and word.isalpha() and word.islower()
+                and (self.__excluded is None
+                     or not self.__excluded.search(word)))
+
+    def filter_descriptions(self,
+                            descriptions: Sequence[str]
+                            ) -> list[list[str]]:
+        """ Get the game words of every description in 'descriptions'. """
+
+        # The annotation pattern doesn't match new lines, so the whole
+        # batch can be normalized at once
+        normalized = self.normalize("\n".join(descriptions)).split("\n")
+        if len(normalized) != len(descriptions):
+            # Some descriptions have new lines
+            normalized = [self.normalize(description)
+                          for description in descriptions]
+        if not self.variation_separator:
+            return [[word] if self.is_game_word(word) else []
+                    for word in normalized]
+        return [
+            [word for word in description.split(self.variation_separator)
+             if self.is_game_word(word)]
+            for description in normalized
+            ]
+
+
+# DEXOnline descriptions
+ROMANIAN: Language = Language(
+    "romanian",
+    replacements=DIACRITICS,
+    annotation_pattern=ANNOTATION_PATTERN,
+    variation_separator=VARIATION_SEPARATOR,
+    )
+# Plain word lists
+ENGLISH: Language = Language("english")
+LANGUAGES: dict[str, Language] = {
+    language.name: language for language in (ROMANIAN, ENGLISH)}
+
+
+def normalize(text: str) -> str:
+    """ Strip the annotations and replace the diacritics of 'text'. """
+
+    return ROMANIAN.normalize(text)
+
+
+def is_game_word(word: str) -> bool:
+    """ Check if a romanian word is ok to be inserted in dictionary. """
+
+    return ROMANIAN.is_game_word(word)
+
+
+def filter_descriptions(descriptions: Sequence[str]) -> list[list[str]]:
+    """ Get the game words of every description in 'descriptions'. """
+
+    return ROMANIAN.filter_descriptions(descriptions)
+
+
+def filter_words(descriptions: Iterable[str]) -> list[str]:
+    """ Get the game words of all 'descriptions'. """
+
+    return [word
+            for words in filter_descriptions(list(descriptions))
+            for word in words]
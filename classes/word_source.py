@@ -0,0 +1,151 @@
+""" Word source module.
+
+Stream the entries of a dictionary file: the DEXOnline xml file or
+a plain word list with one word per line, optionally gzip compressed.
+Every entry is an entry id and a description, the descriptions are
+turned into game words by a 'Language'.
+"""
+
+import gzip
+import os
+import tempfile
+import xml.etree.ElementTree as ET
+from typing import BinaryIO, Callable, Iterable, Iterator, Protocol, TextIO
+
+from classes.word_filter import Language
+
+# Word lists with this suffix are gzip compressed
+GZIP_SUFFIX: str = ".gz"
+# Suffix of the temp files written next to a file and renamed over it
+TEMP_SUFFIX: str = ".tmp"
+
+
+def write_atomic(path: str, write: Callable[[BinaryIO], None]) -> None:
+    """ Write the file 'path' with 'write(file)' to a temp file and
+    rename it over 'path', so 'path' is never half written.
+
+    Every writer gets its own temp file, so concurrent writers
+    (tournament workers) don't write to the same file.
+    """
+
+    descriptor, temp_path = tempfile.mkstemp(
+        TEMP_SUFFIX, os.path.basename(path) + ".",
+        os.path.dirname(path) or None)
+    try:
+        if os.path.exists(path):
+            # Keep the permissions of the replaced file
+            os.chmod(temp_path, os.stat(path).st_mode & 0o777)
+        with os.fdopen(descriptor, "wb") as file:
+            write(file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class WordSource(Protocol):
+    """ Streams the entries of a dictionary file. """
+
+    path: str
+
+    def entries(self) -> Iterator[tuple[int, str]]:
+        """ Stream the id and description of every entry. """
+
+
+class XmlSource:
+    """ DEXOnline xml file: 'Entry' elements with an 'id' attribute,
+    a 'Timestamp' and a 'Description'.
+    """
+
+    path: str
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def entries(self) -> Iterator[tuple[int, str]]:
+        """ Stream the 'id' and description of every xml entry.
+
+        Entries are freed as soon as they are read,
+        so the xml tree is never held in memory.
+        """
+
+        print("... Loading xml file ...")
+        halfway = os.path.getsize(self.path) // 2
+        with open(self.path, "rb") as file:
+            context = ET.iterparse(file, events=("start", "end"))
+            _, root = next(context)
+            for event, element in context:
+                if event != "end" or element.tag != "Entry":
+                    continue
+                if halfway and file.tell() >= halfway:
+                    print("... Halfway there ...")
+                    halfway = 0
+                yield int(element.attrib["id"]), element[1].text or ""
+                # Free the parsed entries
+                root.clear()
+
+
+class TextSource:
+    """ Word list with one word per line (gzip compressed if the file
+    name ends with 'GZIP_SUFFIX').
+
+    The entry id of a word is its line number.
+    """
+
+    path: str
+    compressed: bool
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.compressed = path.endswith(GZIP_SUFFIX)
+
+    def __open(self) -> TextIO:
+        if self.compressed:
+            return gzip.open(self.path, "rt", encoding="utf-8")
+        return open(self.path, encoding="utf-8")
+
+    def entries(self) -> Iterator[tuple[int, str]]:
+        """ Stream the line number and the word of every line. """
+
+        print("... Loading word list ...")
+        with self.__open() as file:
+            for line_no, line in enumerate(file, start=1):
+                yield line_no, line.strip()
+
+    def rewrite(self,
+                added: Iterable[str],
+                removed: set[str],
+                language: Language
+                ) -> None:
+        """ Drop the lines of the 'removed' words and append the 'added'
+        words that aren't in the list, without holding the list in memory.
+        """
+
+        def write(file: BinaryIO) -> None:
+            output = (gzip.GzipFile(fileobj=file, mode="wb")
+                      if self.compressed else file)
+            missing = {language.normalize(word): word for word in added}
+            with self.__open() as source:
+                for line in source:
+                    word = language.normalize(line.strip())
+                    if word not in removed:
+                        output.write((line.rstrip("\n") + "\n").encode())
+                        missing.pop(word, None)
+            output.write("".join(
+                word + "\n" for word in missing.values()).encode())
+            if self.compressed:
+                # Write the gzip trailer, 'file' stays open
+                output.close()
+
+        write_atomic(self.path, write)
+
+
+def word_source(path: str) -> XmlSource | TextSource:
+    """ Get the source of the dictionary file 'path' by its extension. """
+
+    if path.endswith(".xml"):
+        return XmlSource(path)
+    return TextSource(path)
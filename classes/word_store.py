@@ -0,0 +1,132 @@
+""" Word Store class module.
+
+Game words are kept sorted in one string and referred to by their
+index (word id). Start and end bigrams are encoded as small integers.
+"""
+
+from array import array
+from bisect import bisect_left
+from typing import Iterable, Iterator
+
+ALPHABET: str = "abcdefghijklmnopqrstuvwxyz"
+# Number of bigram ids
+BIGRAMS: int = len(ALPHABET) ** 2
+
+_LETTERS: dict[str, int] = {
+    letter: index for index, letter in enumerate(ALPHABET)}
+
+
+def bigram_id(bigram: str) -> int:
+    """ Encode a two letter 'bigram' (-1 if it's not in the alphabet). """
+
+    if len(bigram) != 2:
+        return -1
+    first = _LETTERS.get(bigram[0], -1)
+    second = _LETTERS.get(bigram[1], -1)
+    if first < 0 or second < 0:
+        return -1
+    return first * len(ALPHABET) + second
+
+
+def bigram_text(bigram: int) -> str:
+    """ Decode a bigram id. """
+
+    first, second = divmod(bigram, len(ALPHABET))
+    return ALPHABET[first] + ALPHABET[second]
+
+
+def new_bitset(size: int) -> bytearray:
+    """ Bitset with 'size' bits set to 0. """
+
+    return bytearray((size + 7) // 8)
+
+
+def get_bit(bitset: bytearray, index: int) -> bool:
+    return bool(bitset[index >> 3] & (1 << (index & 7)))
+
+
+def set_bit(bitset: bytearray, index: int) -> None:
+    bitset[index >> 3] |= 1 << (index & 7)
+
+
+def index_bigrams(words: list[str]) -> tuple[array, array]:
+    """ Get the start and end bigram of every word in 'words'. """
+
+    starts = array("H", (bigram_id(word[:2]) for word in words))
+    ends = array("H", (bigram_id(word[-2:]) for word in words))
+    return starts, ends
+
+
+class WordStore:
+    """ Immutable sorted set of game words.
+
+    Words are only made of 'ALPHABET' letters and have at least 2 letters.
+    """
+
+    __text: str
+    __offsets: array
+    starts: array
+    ends: array
+    __start_offsets: array
+
+    def __init__(self, words: Iterable[str]) -> None:
+        words = sorted(set(words))
+        # All words in one string, word 'i' is
+        # text[offsets[i]:offsets[i + 1]]
+        self.__text = "".join(words)
+        self.__offsets = array("I", [0])
+        for word in words:
+            self.__offsets.append(self.__offsets[-1] + len(word))
+        self.starts, self.ends = index_bigrams(words)
+        # Words are sorted so the words with a start bigram are consecutive
+        self.__start_offsets = array("I", [0] * (BIGRAMS + 1))
+        for start in self.starts:
+            self.__start_offsets[start + 1] += 1
+        for bigram in range(BIGRAMS):
+            self.__start_offsets[bigram + 1] += self.__start_offsets[bigram]
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, word_id: int) -> str:
+        return self.__text[
+            self.__offsets[word_id]:self.__offsets[word_id + 1]]
+
+    def __iter__(self) -> Iterator[str]:
+        return (self[word_id] for word_id in range(len(self)))
+
+    def __contains__(self, word: str) -> bool:
+        return self.word_id(word) >= 0
+
+    def word_id(self, word: str) -> int:
+        """ Get the id of 'word' (-1 if it isn't in the store). """
+
+        ids = self.prefix_ids(word[:2])
+        word_id = bisect_left(ids, word, key=self.__getitem__)
+        if word_id < len(ids) and self[ids[word_id]] == word:
+            return ids[word_id]
+        return -1
+
+    def prefix_ids(self, word_start: str) -> range:
+        """ Get the ids of the words that start with 'word_start'. """
+
+        if len(word_start) == 1:
+            first = _LETTERS.get(word_start, -1)
+            if first < 0:
+                return range(0)
+            return range(
+                self.__start_offsets[first * len(ALPHABET)],
+                self.__start_offsets[(first + 1) * len(ALPHABET)])
+        start = bigram_id(word_start[:2])
+        if start < 0:
+            return range(0)
+        ids = range(self.__start_offsets[start],
+                    self.__start_offsets[start + 1])
+        if len(word_start) > 2:
+            # Words that start with 'word_start' are sorted before
+            # 'word_start' followed by the last unicode character
+            ids = ids[
+                bisect_left(ids, word_start, key=self.__getitem__):
+                bisect_left(ids, word_start + chr(0x10FFFF),
+                            key=self.__getitem__)]
+        return ids
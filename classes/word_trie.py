@@ -0,0 +1,213 @@
+""" Word Trie class module.
+
+A trie store of the game words with the same word ids as 'WordStore'.
+Nodes are numbered in depth first order, so the words under a node
+have consecutive ids (the node word first).
+"""
+
+from array import array
+from typing import Iterable, Iterator
+
+from classes.word_store import get_bit, index_bigrams, set_bit
+
+
+class WordTrie:
+    """ Immutable sorted set of game words kept in a trie.
+
+    Every node keeps the number of words under it and the number of
+    words under it that weren't discarded from the dictionary, so
+    membership, prefix counts and random prefix sampling walk at most
+    one node per letter. A game session passes the number of words
+    it played under every node ('path'), which are not counted.
+    """
+
+    # Letter of every node (the root letter is not used)
+    __letters: str
+    # Next node with the same parent (0 if none), the first child
+    # of a node is the next node if it is deeper
+    __next_siblings: array
+    __depths: array
+    # Id of the first word under every node
+    __first_ids: array
+    # Number of words under every node
+    __sizes: array
+    # Number of words under every node that weren't discarded
+    __live_counts: array
+    # Nodes that end a word
+    __terminals: bytearray
+    starts: array
+    ends: array
+
+    def __init__(self, words: Iterable[str]) -> None:
+        words = sorted(set(words))
+        letters = [" "]
+        self.__next_siblings = array("I", [0])
+        self.__depths = array("H", [0])
+        self.__first_ids = array("I", [0])
+        self.__sizes = array("I", [len(words)])
+        terminals = []
+        # Nodes of the previous word by depth
+        path = [0]
+        previous = ""
+        for word_id, word in enumerate(words):
+            common = 0
+            while (common < min(len(word), len(previous))
+                   and word[common] == previous[common]):
+                common += 1
+            # The first new node is a sibling of the previous word node
+            sibling = path[common + 1] if len(path) > common + 1 else 0
+            del path[common + 1:]
+            for node in path[1:]:
+                self.__sizes[node] += 1
+            for depth in range(common, len(word)):
+                node = len(letters)
+                if sibling:
+                    self.__next_siblings[sibling] = node
+                    sibling = 0
+                letters.append(word[depth])
+                self.__next_siblings.append(0)
+                self.__depths.append(depth + 1)
+                self.__first_ids.append(word_id)
+                self.__sizes.append(1)
+                path.append(node)
+            terminals.append(path[-1])
+            previous = word
+        self.__letters = "".join(letters)
+        self.__live_counts = array("I", self.__sizes)
+        self.__terminals = bytearray((len(letters) + 7) // 8)
+        for node in terminals:
+            set_bit(self.__terminals, node)
+        self.starts, self.ends = index_bigrams(words)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, word_id: int) -> str:
+        if not 0 <= word_id < len(self):
+            raise IndexError(word_id)
+        letters = []
+        node = 0
+        while not (get_bit(self.__terminals, node)
+                   and self.__first_ids[node] == word_id):
+            node = self.__child_with_id(node, word_id)
+            letters.append(self.__letters[node])
+        return "".join(letters)
+
+    def __iter__(self) -> Iterator[str]:
+        return (self[word_id] for word_id in range(len(self)))
+
+    def __contains__(self, word: str) -> bool:
+        return self.word_id(word) >= 0
+
+    # region: trie nodes
+    def __children(self, node: int) -> Iterator[int]:
+        child = node + 1
+        if (child == len(self.__depths)
+                or self.__depths[child] != self.__depths[node] + 1):
+            return
+        while child:
+            yield child
+            child = self.__next_siblings[child]
+
+    def __child_with_id(self, node: int, word_id: int) -> int:
+        """ Get the child of 'node' with 'word_id' under it. """
+
+        for child in self.__children(node):
+            if (self.__first_ids[child] <= word_id
+                    < self.__first_ids[child] + self.__sizes[child]):
+                return child
+        raise IndexError(word_id)
+
+    def __find(self, word_start: str) -> int:
+        """ Get the node of 'word_start' (-1 if there is none). """
+
+        node = 0
+        for letter in word_start:
+            for child in self.__children(node):
+                if self.__letters[child] == letter:
+                    node = child
+                    break
+            else:
+                return -1
+        return node
+    # endregion
+
+    # region: queries
+    def word_id(self, word: str) -> int:
+        """ Get the id of 'word' (-1 if it isn't in the trie). """
+
+        node = self.__find(word)
+        if node <= 0 or not get_bit(self.__terminals, node):
+            return -1
+        return self.__first_ids[node]
+
+    def prefix_ids(self, word_start: str) -> range:
+        """ Get the ids of the words that start with 'word_start'. """
+
+        node = self.__find(word_start)
+        if node <= 0:
+            return range(0)
+        first = self.__first_ids[node]
+        return range(first, first + self.__sizes[node])
+    # endregion
+
+    # region: live counts
+    def path(self, word_id: int) -> list[int]:
+        """ Get the nodes from the root to the node of 'word_id'. """
+
+        node = 0
+        nodes = [node]
+        while not (get_bit(self.__terminals, node)
+                   and self.__first_ids[node] == word_id):
+            node = self.__child_with_id(node, word_id)
+            nodes.append(node)
+        return nodes
+
+    def discard(self, word_id: int) -> None:
+        """ Stop counting 'word_id' (removed from the dictionary). """
+
+        for node in self.path(word_id):
+            self.__live_counts[node] -= 1
+
+    def live_count(self,
+                   word_start: str,
+                   played: dict[int, int] | None = None
+                   ) -> int:
+        """ Number of words that start with 'word_start', weren't
+        discarded and weren't 'played' (words played under every node).
+        """
+
+        node = self.__find(word_start)
+        return self.__live_count(node, played or {}) if node > 0 else 0
+
+    def sample_id(self,
+                  word_start: str,
+                  index: int,
+                  played: dict[int, int] | None = None
+                  ) -> int:
+        """ Get the id of the 'index'-th word counted by 'live_count'
+        (-1 if there is none).
+        """
+
+        played = played or {}
+        node = self.__find(word_start)
+        if node <= 0 or not 0 <= index < self.__live_count(node, played):
+            return -1
+        while True:
+            children = [(child, self.__live_count(child, played))
+                        for child in self.__children(node)]
+            own = self.__live_count(node, played) - sum(
+                count for _, count in children)
+            if index < own:
+                # The word of the node comes first
+                return self.__first_ids[node]
+            index -= own
+            for child, count in children:
+                if index < count:
+                    node = child
+                    break
+                index -= count
+
+    def __live_count(self, node: int, played: dict[int, int]) -> int:
+        return self.__live_counts[node] - played.get(node, 0)
+    # endregion
@@ -1,11 +1,25 @@
 """ Main game file. """
 
+import argparse
+import asyncio
+import atexit
+import io
 import os
+import sys
+import threading
+import xml.etree.ElementTree as ET
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from random import shuffle, choice
+from typing import TextIO
 
+from classes import metrics
 from classes.word_dictionary import WordDictionary
 from classes.game import Game
-from classes.player import HumanPlayer, AiPlayer
+from classes.metrics import JsonLinesMetrics, MemoryMetrics
+from classes.player import HumanPlayer, AiPlayer, EXPERT_AI_LEVEL
+from classes.profiler import run_profile
+from classes.server import serve
+from classes.tournament import run_tournament
 
 INPUT_FILE = "DEXOnline.xml"
 
@@ -19,7 +33,10 @@ AI_NAMES = ("shaquille.oatmeal", "fast_and_curious", "casanova",
 def get_ai_level() -> int:
     """ Get input from user how 'smart' should de computer player be. """
 
-    level = input("Enter computer level -> 1(easy) ... 10(hard): ")
+    level = input("Enter computer level -> 1(easy) ... 10(hard) "
+                  "or 'expert': ")
+    if level.strip().lower() == "expert":
+        return int(EXPERT_AI_LEVEL)
     try:
         level = int(float(level))
         if level not in range(1, 11):
@@ -63,18 +80,150 @@ def check_players_no(players_no: str, ai_player: bool) -> int:
 # endregion
 
 
-def main():
-    """ Main function. """
+# region: dictionary loading
+class HeldOutput(io.TextIOBase):
+    """ Standard output that holds what the loading thread prints
+    until 'release' is called, so it doesn't mix with the prompts.
+    """
 
-    # Create words dictionary
-    path = os.path.join("input", INPUT_FILE)
+    def __init__(self, stream: TextIO) -> None:
+        self.stream = stream
+        self.held: list[str] = []
+        self.thread: int | None = None
+
+    def write(self, text: str) -> int:
+        if threading.get_ident() == self.thread:
+            self.held.append(text)
+        else:
+            self.stream.write(text)
+        return len(text)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+    def release(self) -> None:
+        """ Print the held output and restore the standard output. """
+
+        if sys.stdout is self:
+            sys.stdout = self.stream
+        self.stream.write("".join(self.held))
+        self.held = []
+
+
+def load_dictionary(path: str) -> Future:
+    """ Start loading the dictionary on a background thread.
+
+    Return a future of the dictionary. The loading messages are held
+    until 'wait_for_dictionary'.
+    """
+
+    output = HeldOutput(sys.stdout)
+    sys.stdout = output
+
+    def load() -> WordDictionary:
+        output.thread = threading.get_ident()
+        return WordDictionary(path)
+
+    executor = ThreadPoolExecutor(1, thread_name_prefix="dictionary")
+    loading = executor.submit(load)
+    executor.shutdown(wait=False)
+    return loading
+
+
+def wait_for_dictionary(loading: Future) -> WordDictionary | None:
+    """ Wait for the dictionary to load (None if it couldn't load). """
+
+    wait([loading])
+    if isinstance(sys.stdout, HeldOutput):
+        sys.stdout.release()
     try:
-        dictionary = WordDictionary(path)
+        return loading.result()
     except Exception as err:
         print("There was a problem creating the dictionary!")
         print(f"Check that '{INPUT_FILE}' exists and is a valid xml file")
         print(err)
-        return 1
+        return None
+# endregion
+
+
+def enable_metrics(path: str) -> None:
+    """ Record the metrics to the file 'path'. """
+
+    if path.endswith(".prom"):
+        registry = MemoryMetrics()
+        metrics.set_metrics(registry)
+        atexit.register(registry.save_prometheus, path)
+    else:
+        metrics.set_metrics(JsonLinesMetrics(path))
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """ Parse the command line arguments. """
+
+    parser = argparse.ArgumentParser(description="Romanian game 'Fazan'")
+    parser.add_argument(
+        "--compact", action="store_true",
+        help="write the saved dictionary changes to the xml file and exit")
+    parser.add_argument(
+        "--tournament", type=int, default=0, metavar="GAMES",
+        help="play GAMES games between every two computer levels, "
+             "report the results and exit")
+    parser.add_argument(
+        "--serve", type=int, default=None, metavar="PORT",
+        help="serve games against the computer on the local PORT")
+    parser.add_argument(
+        "--metrics", default="", metavar="FILE",
+        help="record timings to FILE, as a Prometheus text dump "
+             "if it ends with '.prom', otherwise as JSON lines")
+    parser.add_argument(
+        "--profile", type=int, default=0, metavar="GAMES",
+        help="profile building and loading the dictionary, GAMES games "
+             "between computer players and saving changes, report the "
+             "hot functions and peak memory of every phase and exit")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None):
+    """ Main function. """
+
+    args = parse_args(argv)
+    if args.metrics:
+        enable_metrics(args.metrics)
+
+    path = os.path.join("input", INPUT_FILE)
+    if args.profile:
+        try:
+            report = run_profile(path, args.profile)
+        except (OSError, ET.ParseError) as err:
+            print(f"Check that '{INPUT_FILE}' exists and is a valid xml file")
+            print(err)
+            return 1
+        print(report.details())
+        return 0
+
+    # Create words dictionary while the players are set up
+    loading = load_dictionary(path)
+
+    if args.compact or args.tournament or args.serve is not None:
+        if (dictionary := wait_for_dictionary(loading)) is None:
+            return 1
+
+    if args.compact:
+        dictionary.compact_xml()
+        return 0
+
+    if args.tournament:
+        report = run_tournament(path, args.tournament,
+                                workers=os.cpu_count() or 1)
+        print(report.summary())
+        return 0
+
+    if args.serve is not None:
+        try:
+            asyncio.run(serve(dictionary, port=args.serve))
+        except KeyboardInterrupt:
+            pass
+        return 0
 
     # AI Player
     if input("Play vs computer ('y' for yes)?: ").lower() == "y":
@@ -95,6 +244,8 @@ def main():
         name = input(f"Player {player + 1} name: ")
         players.append(HumanPlayer(name))
 
+    if (dictionary := wait_for_dictionary(loading)) is None:
+        return 1
     game = Game()
     shuffle(players)
     game.play(players, dictionary)
@@ -0,0 +1,47 @@
+import pytest
+
+from classes.word_dictionary import WordDictionary
+
+# Words that play whole games: most bigrams start and end words
+DESCRIPTIONS = (
+    "mare", "masă", "rece", "sare", "casa", "maca", "rama", "arama",
+    "remar", "arc", "cer", "seara", "aramă", "cama", "cerc", "rasa",
+    "mama", "marc", "ceara", "sac", "ras", "amar", "rac", "scara",
+)
+
+# DEX descriptions with annotations, variants, diacritics and short words
+DEX_DESCRIPTIONS = (
+    "abac",
+    "abator (ind.)",
+    "acar / acadea",
+    "Bacău",
+    "bază",
+    "cabină",
+    "cal",
+    "ox",
+)
+
+
+def write_xml(path, descriptions) -> None:
+    entries = "".join(
+        f'<Entry id="{index}"><Timestamp>0</Timestamp>'
+        f'<Description>{description}</Description></Entry>'
+        for index, description in enumerate(descriptions, start=1)
+        )
+    path.write_text(
+        f'<?xml version="1.0" encoding="UTF-8"?><Root>{entries}</Root>',
+        encoding="utf-8")
+
+
+@pytest.fixture
+def descriptions() -> tuple[str, ...]:
+    """ Descriptions of the 'dictionary' xml file, override per module. """
+
+    return DESCRIPTIONS
+
+
+@pytest.fixture
+def dictionary(tmp_path, descriptions: tuple[str, ...]) -> WordDictionary:
+    path = tmp_path / "dex.xml"
+    write_xml(path, descriptions)
+    return WordDictionary(str(path))
@@ -0,0 +1,43 @@
+import pytest
+
+from classes.bigram_matrix import BigramMatrix
+from classes.word_store import bigram_id
+
+WORDS = ["mare", "masa", "rece", "sare", "casa", "maca", "cal", "abac"]
+
+
+def brute_force_endgame_starts(words: list[str]) -> dict[str, int]:
+    starts = {word[:2] for word in words}
+    endgame_starts = {}
+    for word in words:
+        if word[-2:] not in starts:
+            endgame_starts[word[:2]] = endgame_starts.get(word[:2], 0) + 1
+    return endgame_starts
+
+
+def new_matrix(words: list[str]) -> BigramMatrix:
+    return BigramMatrix([bigram_id(word[:2]) for word in words],
+                        [bigram_id(word[-2:]) for word in words])
+
+
+def test_counts():
+    matrix = new_matrix(WORDS)
+    assert matrix.count(bigram_id("ma"), bigram_id("re")) == 1
+    assert matrix.count(bigram_id("ca"), bigram_id("sa")) == 1
+    assert matrix.start_counts[bigram_id("ma")] == 3
+    assert sum(matrix.column(bigram_id("sa"))) == 2
+    assert bigram_id("ma") not in matrix.endgame_bigrams()
+    assert bigram_id("ac") in matrix.endgame_bigrams()
+
+
+@pytest.mark.parametrize("discarded", [WORDS[:3], WORDS[2:], WORDS[::2]])
+def test_discard_updates_endgame_counts(discarded: list[str]):
+    words = list(WORDS)
+    matrix = new_matrix(words)
+    for word in discarded:
+        words.remove(word)
+        matrix.discard(bigram_id(word[:2]), bigram_id(word[-2:]))
+        expected = brute_force_endgame_starts(words)
+        assert {bigram: matrix.endgame_starts[bigram_id(bigram)]
+                for bigram in expected} == expected
+        assert sum(matrix.endgame_starts) == sum(expected.values())
@@ -0,0 +1,23 @@
+import xml.etree.ElementTree as ET
+
+from benchmarks.dex_generator import write_dex_xml
+from classes.word_dictionary import WordDictionary
+
+
+def test_generated_xml_is_dex_shaped(tmp_path):
+    path = tmp_path / "dex.xml"
+    write_dex_xml(str(path), 2_000)
+    root = ET.parse(path).getroot()
+    assert len(root) == 2_000
+    assert [child.tag for child in root[0]] == ["Timestamp", "Description"]
+    descriptions = [entry[1].text for entry in root]
+    assert any("(" in description for description in descriptions)
+    assert any(" / " in description for description in descriptions)
+    assert any(description[0].isupper() for description in descriptions)
+    assert any(letter in description
+               for description in descriptions for letter in "ăâîșț")
+
+    dictionary = WordDictionary(str(path))
+    assert len(dictionary.words) > 1_000
+    assert all(word.isascii() and word.islower()
+               for word in dictionary.words)
@@ -0,0 +1,78 @@
+import pytest
+
+from classes.events import RecordingSink
+from classes.game import Game
+from classes.player import AiPlayer, HumanPlayer
+from classes.word_dictionary import WordDictionary
+
+
+def fail_input(prompt: str) -> str:
+    raise AssertionError(f"Unexpected prompt: {prompt}")
+
+
+@pytest.mark.parametrize("ai_level", [1, 5, 10])
+def test_headless_game_between_ai_players(
+        monkeypatch: pytest.MonkeyPatch,
+        dictionary: WordDictionary,
+        ai_level: int):
+    monkeypatch.setattr("builtins.input", fail_input)
+    players = [AiPlayer(name, ai_level=ai_level) for name in "abc"]
+    words = set(dictionary.words)
+    sink = RecordingSink()
+    result = Game(sink=sink, interactive=False).play(players, dictionary)
+
+    assert [player.name for player in players
+            if not player.eliminated] == [result.winner]
+    assert len(result.eliminations) == 2
+    assert len(set(result.words)) == len(result.words)
+    assert set(result.words) <= words
+    # Games don't change the dictionary
+    assert dictionary.words == words
+    assert ("winner", {"player": result.winner,
+                       "rounds": result.rounds}) in sink.events
+
+
+def test_computer_ponders_while_human_thinks(
+        monkeypatch: pytest.MonkeyPatch,
+        dictionary: WordDictionary):
+    pondered = []
+
+    class PonderingPlayer(AiPlayer):
+        def ponder(self, word_start, session):
+            pondered.append(word_start)
+
+    prompts = []
+
+    def give_up(prompt: str) -> str:
+        prompts.append(prompt)
+        return "qq"
+    monkeypatch.setattr("builtins.input", give_up)
+    monkeypatch.setattr("classes.game.choice", lambda letters: "m")
+    players = [PonderingPlayer("computer", ai_level=10), HumanPlayer("human")]
+    result = Game(sink=RecordingSink(), interactive=False).play(
+        players, dictionary)
+
+    assert result.winner == "computer"
+    assert len(prompts) == 1
+    assert pondered == [result.words[0][-2:]]
+
+
+def test_next_player_is_found_by_identity(
+        monkeypatch: pytest.MonkeyPatch,
+        dictionary: WordDictionary):
+    pondered = []
+
+    class PonderingPlayer(HumanPlayer):
+        def ponder(self, word_start, session):
+            pondered.append(self)
+
+    answers = iter(["mare", "rece"])
+    monkeypatch.setattr("builtins.input", lambda prompt: next(answers, "qq"))
+    monkeypatch.setattr("classes.game.choice", lambda letters: "m")
+    # Same name, so the players compare equal
+    players = [PonderingPlayer("ana"), PonderingPlayer("ana"),
+               PonderingPlayer("ana")]
+    Game(sink=RecordingSink(), interactive=False).play(players, dictionary)
+
+    assert pondered[0] is players[2]
+    assert pondered[1] is players[0]
@@ -0,0 +1,139 @@
+import pytest
+
+from classes.word_dictionary import WordDictionary
+from classes.word_store import bigram_id
+from test.conftest import DESCRIPTIONS, write_xml
+
+
+@pytest.fixture
+def descriptions() -> tuple[str, ...]:
+    return ("abac", "abator", "acar / acadea", "bază", "cabină", "cal",
+            "mare", "masă", "rece", "sare", "casa", "maca")
+
+
+def live_endgame_words(dictionary: WordDictionary,
+                       played_words: set[str]) -> set[str]:
+    words = dictionary.words - played_words
+    return {word for word in words
+            if not any(other.startswith(word[-2:]) for other in words)}
+
+
+@pytest.mark.parametrize(
+    "word_start, expected",
+    [
+        ("a", {"abac", "abator", "acar", "acadea"}),
+        ("ab", {"abac", "abator"}),
+        ("aba", {"abac", "abator"}),
+        ("ca", {"cabina", "cal", "casa"}),
+        ("zz", set()),
+    ]
+)
+def test_get_word_uses_prefix(
+        dictionary: WordDictionary, word_start: str, expected: set[str]):
+    word = dictionary.new_session().get_word(word_start, no_endgame=False)
+    if expected:
+        assert word in expected
+    else:
+        assert word == ""
+
+
+def test_discarded_word_is_not_offered_again(dictionary: WordDictionary):
+    session = dictionary.new_session()
+    session.discard_word("abac")
+    session.discard_word("abator")
+    assert session.get_word("ab") == ""
+    assert session.get_word("a", no_endgame=False) in {"acar", "acadea"}
+
+
+def test_smart_ai_avoids_giving_endgame_words(dictionary: WordDictionary):
+    session = dictionary.new_session()
+    session.discard_word("maca")
+    # 'mare' lets the next player answer with the endgame word 'rece'
+    assert session.get_word("ma", smart_ai=True) == "masa"
+    session.discard_word("rece")
+    assert session.get_word("ma", smart_ai=True) in {"mare", "masa"}
+
+
+def test_endgame_words_follow_discarded_words(dictionary: WordDictionary):
+    session = dictionary.new_session()
+    assert not session.is_endgame_word("maca")
+    for word in ("casa", "cal", "cabina"):
+        session.discard_word(word)
+    # No word starts with 'ca' anymore
+    assert session.is_endgame_word("maca")
+    for word in ("rece", "sare", "acar", "mare"):
+        session.discard_word(word)
+        endgame_words = live_endgame_words(dictionary, session.played_words)
+        assert {word for word in dictionary.words
+                if session.is_endgame_word(word)} == endgame_words
+        # Smart AI prefers words that leave no endgame words
+        for word_start in ("ab", "ac", "ba", "ca", "ma", "re", "sa"):
+            safe_words = {
+                word for word in dictionary.prefix_words(word_start)
+                if word not in session.played_words
+                and not session.is_endgame_word(word)
+                and not endgame_words.intersection(
+                    dictionary.prefix_words(word[-2:]))}
+            word = session.get_word(word_start, smart_ai=True)
+            if safe_words:
+                assert word in safe_words
+
+
+def test_sessions_share_the_dictionary(dictionary: WordDictionary):
+    words = set(dictionary.words)
+    first = dictionary.new_session()
+    second = dictionary.new_session()
+    first.discard_word("abac")
+    first.discard_word("abator")
+    assert first.get_word("ab") == ""
+    assert second.get_word("ab") in {"abac", "abator"}
+    assert dictionary.words == words
+
+
+def test_removed_word_is_removed_from_every_session(
+        dictionary: WordDictionary):
+    first = dictionary.new_session()
+    second = dictionary.new_session()
+    second.discard_word("casa")
+    second.discard_word("cal")
+    first.discard_word("cabina", remove=True)
+    assert "cabina" not in dictionary.words
+    assert first.get_word("ca") == "casa"
+    # The last 'ca' word of the second session is gone
+    assert second.get_word("ca") == ""
+    assert second.is_endgame_word("maca")
+    assert not first.is_endgame_word("maca")
+
+
+def test_difficulty_and_traps(dictionary: WordDictionary):
+    session = dictionary.new_session()
+    # 'ma' words: 'maca' ends the game, 'mare' lets 'rece' end the game
+    assert session.difficulty(bigram_id("ma")) == pytest.approx(2 / 3)
+    assert not session.is_trap(bigram_id("ma"))
+    session.discard_word("maca")
+    session.discard_word("masa")
+    # 'mare' is the only 'ma' word left
+    assert session.difficulty(bigram_id("ma")) == 1.0
+    assert session.is_trap(bigram_id("ma"))
+    assert session.difficulty(bigram_id("zz")) == 1.0
+    assert not session.is_trap(bigram_id("zz"))
+
+
+def test_backends_agree_on_live_words(tmp_path):
+    path = tmp_path / "dex.xml"
+    write_xml(path, DESCRIPTIONS)
+    for backend in ("store", "trie"):
+        dictionary = WordDictionary(str(path), backend=backend,
+                                    use_cache=False)
+        session = dictionary.new_session()
+        session.discard_word("mare")
+        session.discard_word("masa", remove=True)
+        assert session.has_prefix("ma")
+        assert session.random_word("ma") in {"maca", "mama", "marc"}
+        for word in ("maca", "mama", "marc"):
+            session.discard_word(word)
+        assert not session.has_prefix("ma")
+        assert session.random_word("ma") == ""
+        assert session.get_word("ma", no_endgame=False) == ""
+        # Played words only count in their own session
+        assert dictionary.new_session().random_word("mar") in {"mare", "marc"}
@@ -1,3 +1,6 @@
+import sys
+import threading
+
 import pytest
 
 import main
@@ -12,6 +15,8 @@ from classes.player import AiPlayer, SMART_AI_THRESHOLD
         ("1.7", 1),
         ("0", 0),
         ("11", 0),
+        ("expert", 11),
+        (" Expert", 11),
         ("", 0),
         ("z", 0),
     ]
@@ -61,3 +66,72 @@ def test_input_from_user_for_number_of_human_players(
     assert main.check_players_no(
             human_players_number_input, ai_player_exists
         ) == human_players_number_returned
+
+
+@pytest.mark.parametrize(
+    "argv, compact, tournament, profile",
+    [
+        ([], False, 0, 0),
+        (["--compact"], True, 0, 0),
+        (["--tournament", "100"], False, 100, 0),
+        (["--profile", "5"], False, 0, 5),
+    ]
+)
+def test_command_line_arguments(
+        argv: list[str], compact: bool, tournament: int, profile: int):
+    args = main.parse_args(argv)
+    assert args.compact == compact
+    assert args.tournament == tournament
+    assert args.profile == profile
+
+
+def test_dictionary_loads_during_player_setup(
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture):
+    answered = threading.Event()
+    played = []
+
+    def load(path: str) -> str:
+        print("... Loading xml file ...")
+        # Loading ends only after the setup questions were answered
+        assert answered.wait(5)
+        return "dictionary"
+
+    class FakeGame:
+        def play(self, players, dictionary):
+            played.append((players, dictionary))
+
+    answers = iter(["y", "expert", "1", "ana"])
+
+    def answer(prompt: str) -> str:
+        print(prompt)
+        try:
+            return next(answers)
+        finally:
+            if prompt.startswith("Player 1 name"):
+                answered.set()
+
+    monkeypatch.setattr("main.WordDictionary", load)
+    monkeypatch.setattr("main.Game", FakeGame)
+    monkeypatch.setattr("builtins.input", answer)
+    assert main.main([]) == 0
+    [(players, dictionary)] = played
+    assert dictionary == "dictionary"
+    assert len(players) == 2
+    # The loading messages are printed after the prompts
+    output = capsys.readouterr().out.splitlines()
+    assert output[-1] == "... Loading xml file ..."
+    assert output[-2].startswith("Player 1 name")
+    assert not isinstance(sys.stdout, main.HeldOutput)
+
+
+def test_dictionary_load_error(monkeypatch: pytest.MonkeyPatch,
+                               capsys: pytest.CaptureFixture):
+    def load(path: str):
+        raise ValueError("not an xml file")
+
+    monkeypatch.setattr("main.WordDictionary", load)
+    assert main.main(["--compact"]) == 1
+    output = capsys.readouterr().out
+    assert "There was a problem creating the dictionary!" in output
+    assert "not an xml file" in output
@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+from classes import metrics
+from classes.events import NullSink
+from classes.game import Game
+from classes.metrics import JsonLinesMetrics, MemoryMetrics
+from classes.player import AiPlayer
+from classes.word_dictionary import WordDictionary
+from test.conftest import DESCRIPTIONS, write_xml
+
+
+@pytest.fixture
+def registry():
+    registry = MemoryMetrics()
+    metrics.set_metrics(registry)
+    yield registry
+    metrics.set_metrics(None)
+
+
+def test_metrics_are_off_by_default():
+    assert not metrics.enabled()
+    with metrics.timer("noop"):
+        pass
+    metrics.count("noop")
+
+
+def test_game_metrics(tmp_path, registry: MemoryMetrics):
+    path = tmp_path / "dex.xml"
+    write_xml(path, DESCRIPTIONS)
+    dictionary = WordDictionary(str(path))
+    players = [AiPlayer("first", ai_level=3.0),
+               AiPlayer("second", ai_level=8.0)]
+    result = Game(sink=NullSink(), interactive=False).play(
+        players, dictionary)
+    timers = registry.timers
+    assert timers[("turn", (("player", "AiPlayer"),))].count >= len(
+        result.words)
+    assert {labels for name, labels in timers if name == "get_word"} <= {
+        (("smart", "yes"),), (("smart", "no"),)}
+    discarded = timers.get(("discard_word", ()))
+    assert (discarded.count if discarded else 0) == len(result.words)
+    assert timers[("build", (("phase", "store"),))].count == 1
+
+    dictionary.remove_words("mare", "rece")
+    assert registry.counters[("words_removed", ())] == 2
+    text = registry.prometheus()
+    assert "fazan_words_removed_total 2\n" in text
+    assert 'fazan_build_seconds_count{phase="store"} 1\n' in text
+
+
+def test_json_lines_metrics(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    metrics.set_metrics(JsonLinesMetrics(str(path)))
+    try:
+        with metrics.timer("save_xml"):
+            pass
+        metrics.count("words_removed", 3, source="test")
+    finally:
+        metrics.set_metrics(None)
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert records[0]["metric"] == "save_xml"
+    assert records[0]["seconds"] >= 0
+    assert records[1]["count"] == 3
+    assert records[1]["source"] == "test"
@@ -0,0 +1,95 @@
+import os
+
+import pytest
+
+from classes.opening_book import BOOK_SUFFIX, OpeningBook
+from classes.player import AiPlayer
+from classes.word_dictionary import WordDictionary
+from test.conftest import DESCRIPTIONS, write_xml
+
+
+@pytest.fixture
+def path(tmp_path) -> str:
+    path = tmp_path / "dex.xml"
+    write_xml(path, DESCRIPTIONS)
+    return str(path)
+
+
+def test_openings_are_safe(path: str):
+    dictionary = WordDictionary(path)
+    book = dictionary.opening_book()
+    session = dictionary.new_session()
+    assert book.openings["m"]
+    for letter, openings in book.openings.items():
+        assert len(openings) == len(
+            {(word[:2], word[-2:]) for word in openings})
+        for word in openings:
+            assert word.startswith(letter)
+            assert not session.is_endgame_word(word)
+    assert book.openings["z"] == []
+
+
+def test_book_is_saved_and_invalidated(
+        monkeypatch: pytest.MonkeyPatch, path: str):
+    WordDictionary(path)
+    assert os.path.exists(path + BOOK_SUFFIX)
+
+    def fail_build(*args, **kwargs):
+        raise AssertionError("The opening book was rebuilt")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(OpeningBook, "build", fail_build)
+        assert WordDictionary(path).opening_book() is not None
+
+    dictionary = WordDictionary(path)
+    dictionary.remove_words("mare")
+    dictionary.save_xml()
+    dictionary.flush()
+    reloaded = WordDictionary(path)
+    assert reloaded.opening_book().fingerprint == reloaded.fingerprint()
+    assert all("mare" not in openings
+               for openings in reloaded.opening_book().openings.values())
+
+
+def test_smart_ai_opens_from_the_book(path: str):
+    dictionary = WordDictionary(path)
+    book = dictionary.opening_book()
+    session = dictionary.new_session()
+    player = AiPlayer("smart", ai_level=10.0)
+    word = player.play("m", session, no_endgame_input=True,
+                       interactive=False)
+    assert (word[:2], word[-2:]) == (book.openings["m"][0][:2],
+                                     book.openings["m"][0][-2:])
+
+
+def test_book_is_not_built_during_a_game(
+        monkeypatch: pytest.MonkeyPatch, path: str):
+    dictionary = WordDictionary(path)
+    book = dictionary.opening_book()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("The opening book was rebuilt")
+    monkeypatch.setattr(OpeningBook, "build", fail)
+    monkeypatch.setattr(WordDictionary, "fingerprint", fail)
+    dictionary.remove_words(book.openings["m"][0])
+    assert dictionary.opening_book() is book
+    session = dictionary.new_session()
+    player = AiPlayer("smart", ai_level=10.0)
+    word = player.play("m", session, no_endgame_input=True,
+                       interactive=False)
+    assert word.startswith("m")
+    assert word in dictionary.words
+
+
+@pytest.mark.parametrize("use_cache", [True, False])
+def test_smart_ai_opens_without_a_book(
+        monkeypatch: pytest.MonkeyPatch, path: str, use_cache: bool):
+    def fail_build(*args, **kwargs):
+        raise RecursionError("maximum recursion depth exceeded")
+    monkeypatch.setattr(OpeningBook, "build", fail_build)
+    dictionary = WordDictionary(path, use_cache=use_cache)
+    assert dictionary.opening_book() is None
+    session = dictionary.new_session()
+    player = AiPlayer("smart", ai_level=10.0)
+    assert player.play("m", session, no_endgame_input=True,
+                       interactive=False).startswith("m")
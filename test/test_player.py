@@ -0,0 +1,31 @@
+import pytest
+
+from classes.player import check_word
+from classes.word_dictionary import WordDictionary
+from test.conftest import DEX_DESCRIPTIONS
+
+
+@pytest.fixture
+def descriptions() -> tuple[str, ...]:
+    return DEX_DESCRIPTIONS
+
+
+@pytest.mark.parametrize(
+    "word, word_start, no_endgame_input, error",
+    [
+        ("abac", "ab", False, ""),
+        ("ab", "ab", False, "'ab' has less than 3 letters!"),
+        ("acar", "ab", False, "'acar' doesn't starts with 'ab'"),
+        ("cal", "ca", False, "'cal' has already been played this game!"),
+        ("acar", "a", True,
+         "You can't eliminate a player with the first word!)"),
+        ("abac", "a", True, ""),
+        # Not in the dictionary, checked by the players
+        ("abcd", "ab", False, ""),
+    ]
+)
+def test_check_word(dictionary: WordDictionary, word: str, word_start: str,
+                    no_endgame_input: bool, error: str):
+    session = dictionary.new_session()
+    session.discard_word("cal")
+    assert check_word(word, word_start, session, no_endgame_input) == error
@@ -0,0 +1,33 @@
+import tracemalloc
+
+from classes.profiler import ProfileReport, PhaseProfile, run_profile
+from test.conftest import DESCRIPTIONS, write_xml
+
+
+def test_profile_every_phase(tmp_path):
+    path = tmp_path / "dex.xml"
+    write_xml(path, DESCRIPTIONS)
+    xml = path.read_text(encoding="utf-8")
+    report = run_profile(str(path), games=2, levels=(5.0, 11.0), top=5)
+
+    assert [phase.name for phase in report.phases] == [
+        "build", "load", "endgame", "moves", "save"]
+    assert all(phase.seconds > 0 for phase in report.phases)
+    assert report.phase("build").peak_memory > 0
+    assert "__init__" in report.phase("load").hot_functions
+    assert "cumulative" in report.phase("moves").hot_functions
+    assert report.phase("save").memory_lines
+    # The profile runs on a copy of the xml file
+    assert path.read_text(encoding="utf-8") == xml
+    assert sorted(file.name for file in tmp_path.iterdir()) == ["dex.xml"]
+    assert not tracemalloc.is_tracing()
+
+
+def test_profile_summary():
+    report = ProfileReport(
+        [PhaseProfile("load", 0.5, 2**20), PhaseProfile("moves", 2.0)],
+        moves=1000)
+    lines = report.summary().splitlines()
+    assert lines[1].split() == ["load", "0.500s", "1.0", "MiB"]
+    assert lines[-1] == "1000 moves, 2.000 ms/move"
+    assert "=== moves ===" in report.details()
@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+from classes.server import GameServer
+from classes.word_dictionary import WordDictionary
+
+
+async def play_client(port: int, dictionary: WordDictionary) -> list[str]:
+    """ Play a game choosing the words with a local session. """
+
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    session = dictionary.new_session()
+    replies = [(await reader.readline()).decode().strip()]
+    writer.write(b"NEW 5\n")
+    while replies[-1] not in ("WIN", "LOSE"):
+        reply = (await reader.readline()).decode().strip()
+        replies.append(reply)
+        command, _, argument = reply.partition(" ")
+        if command == "AI" and argument != "qq":
+            session.discard_word(argument)
+        elif command == "TURN":
+            word = session.get_word(argument, no_endgame=len(argument) == 1)
+            if not word or (len(argument) == 1 and
+                            session.is_endgame_word(word)):
+                writer.write(b"QUIT\n")
+            else:
+                session.discard_word(word)
+                writer.write(f"WORD {word}\n".encode())
+    writer.close()
+    return replies
+
+
+def test_concurrent_games(dictionary: WordDictionary):
+    async def run() -> list[list[str]]:
+        server = GameServer(dictionary)
+        listener = await server.start()
+        port = listener.sockets[0].getsockname()[1]
+        async with listener:
+            return await asyncio.gather(
+                *(play_client(port, dictionary) for _ in range(20)))
+
+    for replies in asyncio.run(run()):
+        assert replies[0] == "READY"
+        assert replies[-1] in ("WIN", "LOSE")
+        assert not any(reply.startswith("ERROR") for reply in replies)
+
+
+def test_rejected_commands(monkeypatch: pytest.MonkeyPatch,
+                           dictionary: WordDictionary):
+    # The client moves first with the start letter 'z'
+    monkeypatch.setattr("classes.server.choice", lambda options: options[-1])
+
+    async def run() -> list[str]:
+        listener = await GameServer(dictionary).start()
+        port = listener.sockets[0].getsockname()[1]
+        async with listener:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            replies = []
+            for command in (b"WORD mare\n", b"NEW 11\n", b"NEW 3\n",
+                            b"WORD xy\n", b"HINT\n", b"QUIT\n", b"QUIT\n"):
+                writer.write(command)
+                await writer.drain()
+            while line := await reader.readline():
+                replies.append(line.decode().strip())
+            return replies
+
+    replies = asyncio.run(run())
+    assert replies[0] == "READY"
+    assert replies[1].startswith("ERROR no game")
+    assert replies[2].startswith("ERROR '11'")
+    assert replies[3] == "TURN z"
+    assert replies[4].startswith("ERROR 'xy'")
+    assert replies[5] == "HINT no"
+    assert replies[-1] == "LOSE"
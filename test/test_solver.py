@@ -0,0 +1,150 @@
+import threading
+from functools import cache
+
+import pytest
+
+from benchmarks.bench_word_filter import sample_descriptions
+from classes import metrics
+from classes.metrics import MemoryMetrics
+from classes.player import AiPlayer, EXPERT_AI_LEVEL
+from classes.solver import Solver
+from classes.word_dictionary import WordDictionary
+from classes.word_store import bigram_id
+
+BIGRAMS = ("ma", "re", "sa", "ca", "ra", "ar", "ce", "rc", "ac", "zz")
+
+
+def brute_force_wins(words: set[str]):
+    """ Check if the player to move from a bigram wins,
+    by playing every word.
+    """
+
+    @cache
+    def wins(bigram: str, played: frozenset[str]) -> bool:
+        moves = [word for word in words - played if word.startswith(bigram)]
+        return any(
+            not any(other.startswith(word[-2:])
+                    for other in words - played - {word})
+            or not wins(word[-2:], played | {word})
+            for word in moves)
+    return wins
+
+
+@pytest.mark.parametrize("played", [(), ("mare", "cerc"), ("arc", "rasa")])
+def test_solver_matches_brute_force(dictionary: WordDictionary,
+                                    played: tuple[str, ...]):
+    session = dictionary.new_session()
+    for word in played:
+        session.discard_word(word)
+    wins = brute_force_wins(dictionary.words)
+    solver = Solver(dictionary, max_nodes=1_000_000)
+    for bigram in BIGRAMS:
+        assert solver.solve(session, bigram_id(bigram)) == wins(
+            bigram, frozenset(played))
+
+
+def test_best_word_wins(dictionary: WordDictionary):
+    session = dictionary.new_session()
+    wins = brute_force_wins(dictionary.words)
+    solver = Solver(dictionary, max_nodes=1_000_000)
+    for bigram in BIGRAMS:
+        word = solver.best_word(session, bigram)
+        if wins(bigram, frozenset()):
+            assert word.startswith(bigram)
+            # The next player loses
+            assert not session.get_word(word[-2:]) or not wins(
+                word[-2:], frozenset({word}))
+        else:
+            assert word == ""
+
+
+def test_out_of_nodes(dictionary: WordDictionary):
+    solver = Solver(dictionary, max_nodes=0)
+    assert solver.solve(dictionary.new_session(), bigram_id("ma")) is None
+    assert solver.best_word(dictionary.new_session(), "re") == ""
+
+
+def test_expert_ai_plays_the_solver_word(dictionary: WordDictionary):
+    player = AiPlayer("expert", ai_level=EXPERT_AI_LEVEL)
+    assert player.expert and player.smart
+    session = dictionary.new_session()
+    wins = brute_force_wins(dictionary.words)
+    for bigram in BIGRAMS:
+        word = player.play(bigram, session, interactive=False)
+        if wins(bigram, frozenset()):
+            assert not wins(word[-2:], frozenset({word})) or not any(
+                other.startswith(word[-2:])
+                for other in dictionary.words - {word})
+
+
+def test_dense_dictionary_with_default_budgets(tmp_path):
+    # Random words: most bigrams start words, games can be very long
+    path = tmp_path / "words.txt"
+    path.write_text("\n".join(sample_descriptions(20_000)) + "\n",
+                    encoding="utf-8")
+    dictionary = WordDictionary(str(path), use_cache=False)
+    session = dictionary.new_session()
+    session.discard_word(session.get_word("ma"))
+    played = dict(session.played_pairs)
+    solver = Solver(dictionary)
+    for bigram in BIGRAMS:
+        solver.solve(session, bigram_id(bigram))
+        solver.best_end(session, bigram_id(bigram))
+        # The moves searched are taken back when the search gives up
+        assert session.played_pairs == played
+    player = AiPlayer("expert", ai_level=EXPERT_AI_LEVEL)
+    for bigram in BIGRAMS[:-1]:
+        assert player.play(bigram, session, interactive=False).startswith(
+            bigram)
+
+
+def wait_for_speculation() -> None:
+    for thread in threading.enumerate():
+        if thread.name == "solver-speculation":
+            thread.join()
+
+
+@pytest.mark.parametrize("word", ["mare", "masa", "maca", "mama"])
+def test_speculated_reply_matches_solved_reply(dictionary: WordDictionary,
+                                               word: str):
+    session = dictionary.new_session()
+    solver = Solver(dictionary, max_nodes=1_000_000)
+    solver.speculate(session, bigram_id("ma"))
+    wait_for_speculation()
+    session.discard_word(word)
+    sink = MemoryMetrics()
+    metrics.set_metrics(sink)
+    try:
+        reply = solver.best_end(session, bigram_id(word[-2:]))
+    finally:
+        metrics.set_metrics(None)
+    assert sink.counters == {("speculation_hits", ()): 1}
+    assert reply == Solver(dictionary, max_nodes=1_000_000).best_end(
+        session, bigram_id(word[-2:]))
+
+
+def test_discarded_word_invalidates_speculation(dictionary: WordDictionary):
+    session = dictionary.new_session()
+    solver = Solver(dictionary, max_nodes=1_000_000)
+    solver.speculate(session, bigram_id("ma"))
+    wait_for_speculation()
+    session.discard_word("mare")
+    session.discard_word("rece")
+    sink = MemoryMetrics()
+    metrics.set_metrics(sink)
+    try:
+        solver.best_end(session, bigram_id("re"))
+    finally:
+        metrics.set_metrics(None)
+    assert not sink.counters
+
+
+def test_expert_ai_ponders(dictionary: WordDictionary):
+    player = AiPlayer("expert", ai_level=EXPERT_AI_LEVEL)
+    session = dictionary.new_session()
+    player.ponder("ma", session)
+    session.discard_word("mare")
+    # Playing stops the speculation
+    assert player.play("re", session, interactive=False).startswith("re")
+    assert not any(thread.name == "solver-speculation"
+                   for thread in threading.enumerate())
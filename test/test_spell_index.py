@@ -0,0 +1,58 @@
+import pytest
+
+from classes.events import RecordingSink
+from classes.player import HumanPlayer
+from classes.spell_index import SpellIndex, edit_distance
+from classes.word_dictionary import WordDictionary
+
+
+@pytest.mark.parametrize(
+    "first, second, distance",
+    [
+        ("mare", "mare", 0),
+        ("mare", "mase", 1),
+        ("mare", "maer", 1),
+        ("mare", "mar", 1),
+        ("mare", "maree", 1),
+        ("mare", "amre", 1),
+        ("mare", "sac", 3),
+        ("", "sac", 3),
+    ]
+)
+def test_edit_distance(first: str, second: str, distance: int):
+    assert edit_distance(first, second) == distance
+    assert edit_distance(second, first) == distance
+
+
+@pytest.mark.parametrize("typo", ["maer", "mar", "maree", "mase", "mmare"])
+def test_candidates_include_close_words(typo: str):
+    words = ["arc", "mare", "marc", "masa", "sac"]
+    index = SpellIndex(words)
+    assert words.index("mare") in index.candidates(typo)
+
+
+def test_suggestions_follow_the_game(dictionary: WordDictionary):
+    session = dictionary.new_session()
+    assert session.suggest_words("masr", "ma") == ["masa", "marc", "mare"]
+    assert session.suggest_words("masr", "ma", count=1) == ["masa"]
+    session.discard_word("mare")
+    dictionary.remove_words("masa")
+    assert session.suggest_words("masr", "ma") == ["marc"]
+    # Suggestions start with the required start
+    assert session.suggest_words("rasc", "ra") == ["rac", "ras", "rasa"]
+    assert session.suggest_words("rasc", "ras") == ["ras", "rasa"]
+    assert session.suggest_words("zzzz", "zz") == []
+
+
+def test_human_player_gets_suggestions(
+        monkeypatch: pytest.MonkeyPatch, dictionary: WordDictionary):
+    answers = iter(["maer", "no", "mare"])
+    monkeypatch.setattr("builtins.input", lambda _: next(answers))
+    monkeypatch.setattr("classes.player.random", lambda: 0.0)
+    sink = RecordingSink()
+    word = HumanPlayer("human").play("ma", dictionary.new_session(),
+                                     sink=sink)
+    assert word == "mare"
+    assert ("did_you_mean", {"player": "human", "word": "maer",
+                             "suggestions": ["mare", "marc"]}
+            ) in sink.events
@@ -0,0 +1,24 @@
+from classes.tournament import ELO_START, TournamentReport, run_tournament
+from test.conftest import DESCRIPTIONS, write_xml
+
+
+def test_elo_rating_follows_results():
+    report = TournamentReport()
+    for _ in range(10):
+        report.add_game(8, 2, winner=8, rounds=3)
+    assert report.levels[8].win_rate == 1.0
+    assert report.levels[8].elo > ELO_START > report.levels[2].elo
+    assert report.levels[8].elo + report.levels[2].elo == 2 * ELO_START
+    assert report.levels[2].mean_rounds == 3
+
+
+def test_tournament_between_ai_levels(tmp_path):
+    path = tmp_path / "dex.xml"
+    write_xml(path, DESCRIPTIONS)
+    report = run_tournament(str(path), games=4, levels=(1, 5, 10), workers=2)
+    assert report.games == 12
+    assert set(report.levels) == {1, 5, 10}
+    assert all(stats.games == 8 for stats in report.levels.values())
+    assert sum(stats.wins for stats in report.levels.values()) == 12
+    assert report.games_per_second > 0
+    assert "games/s" in report.summary()
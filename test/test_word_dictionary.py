@@ -0,0 +1,283 @@
+import threading
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from classes import metrics, word_dictionary
+from classes.metrics import MemoryMetrics
+from classes.word_dictionary import WordDictionary
+from classes.word_filter import (ANNOTATION_PATTERN, DIACRITICS, ENGLISH,
+                                 ROMANIAN, VARIATION_SEPARATOR, Language)
+from test.conftest import DEX_DESCRIPTIONS, write_xml
+
+@pytest.fixture
+def descriptions() -> tuple[str, ...]:
+    return DEX_DESCRIPTIONS
+
+
+def test_build_filters_words(dictionary: WordDictionary):
+    assert dictionary.words == {
+        "abac", "abator", "acar", "acadea", "baza", "cabina", "cal"}
+    # Only 'ab', 'ac', 'ba' and 'ca' start a word
+    assert dictionary.endgame_words == {
+        "abator", "acar", "acadea", "baza", "cabina", "cal"}
+
+
+def test_chunked_build_matches_whole_build(
+        tmp_path, monkeypatch: pytest.MonkeyPatch):
+    path = tmp_path / "dex.xml"
+    write_xml(path, DEX_DESCRIPTIONS)
+    whole = WordDictionary(str(path), use_cache=False)
+    monkeypatch.setattr("classes.word_dictionary.BUILD_CHUNK_SIZE", 3)
+    chunked = WordDictionary(str(path), use_cache=False)
+    assert chunked.words == whole.words
+    assert chunked.endgame_words == whole.endgame_words
+
+
+def test_compiled_dictionary_is_loaded_without_parsing(
+        tmp_path, monkeypatch: pytest.MonkeyPatch):
+    path = tmp_path / "dex.xml"
+    write_xml(path, DEX_DESCRIPTIONS)
+    built = WordDictionary(str(path))
+    assert (tmp_path / "dex.xml.cache").exists()
+
+    def fail_parse(*args, **kwargs):
+        raise AssertionError("xml file shouldn't be parsed")
+    monkeypatch.setattr("xml.etree.ElementTree.parse", fail_parse)
+    cached = WordDictionary(str(path))
+    assert cached.words == built.words
+    assert cached.endgame_words == built.endgame_words
+    assert cached.prefix_words("ab") == built.prefix_words("ab")
+
+
+def test_compiled_dictionary_is_invalidated(tmp_path):
+    path = tmp_path / "dex.xml"
+    write_xml(path, DEX_DESCRIPTIONS)
+    WordDictionary(str(path))
+    write_xml(path, ("zebra",))
+    assert WordDictionary(str(path)).words == {"zebra"}
+
+
+def test_changes_are_journaled(tmp_path):
+    path = tmp_path / "dex.xml"
+    write_xml(path, DEX_DESCRIPTIONS)
+    xml = path.read_text(encoding="utf-8")
+    dictionary = WordDictionary(str(path))
+    dictionary.add_words("cartof")
+    dictionary.remove_words("acadea")
+    dictionary.save_xml()
+    assert path.read_text(encoding="utf-8") == xml
+    assert (tmp_path / "dex.xml.cache").exists()
+
+    reloaded = WordDictionary(str(path))
+    assert "cartof" in reloaded.words
+    assert "acadea" not in reloaded.words
+    # 'of' doesn't start any word
+    assert "cartof" in reloaded.endgame_words
+
+
+def test_journal_words_are_compiled(tmp_path, monkeypatch):
+    path = tmp_path / "dex.xml"
+    write_xml(path, DEX_DESCRIPTIONS)
+    dictionary = WordDictionary(str(path))
+    dictionary.add_words("cartof")
+    dictionary.remove_words("acadea")
+    dictionary.save_xml()
+    dictionary.flush()
+    # The store is rebuilt once with the journal words and saved
+    assert "cartof" in WordDictionary(str(path)).words
+
+    def fail_build(*args, **kwargs):
+        raise AssertionError("store shouldn't be rebuilt")
+    with monkeypatch.context() as patch:
+        patch.setattr("classes.word_dictionary.SpellIndex", fail_build)
+        reloaded = WordDictionary(str(path))
+    assert "cartof" in reloaded.words
+    assert "acadea" not in reloaded.words
+    assert "cartof" in reloaded.endgame_words
+
+    # A journal that doesn't start with the compiled lines is rebuilt
+    (tmp_path / "dex.xml.journal").write_text(
+        "add\tzar\t0\n", encoding="utf-8")
+    reloaded = WordDictionary(str(path))
+    assert "zar" in reloaded.words
+    assert "cartof" not in reloaded.words
+    assert "acadea" in reloaded.words
+
+
+def test_journal_is_compacted_into_xml(tmp_path):
+    path = tmp_path / "dex.xml"
+    write_xml(path, DEX_DESCRIPTIONS)
+    dictionary = WordDictionary(str(path))
+    dictionary.add_words("zar")
+    dictionary.remove_words("acadea")
+    dictionary.compact_xml()
+    xml = path.read_text(encoding="utf-8")
+    assert "acar / __acadea" in xml
+    assert "zar (added by fazan)" in xml
+    assert not (tmp_path / "dex.xml.journal").exists()
+    assert not (tmp_path / "dex.xml.cache").exists()
+    reloaded = WordDictionary(str(path))
+    assert "zar" in reloaded.words
+    assert "acadea" not in reloaded.words
+
+
+@pytest.mark.parametrize("name", ["dex.xml", "words.txt"])
+def test_word_removed_and_added_again_is_compacted(tmp_path, name: str):
+    path = tmp_path / name
+    if name.endswith(".xml"):
+        write_xml(path, ("mare", "masă", "rece"))
+    else:
+        path.write_text("mare\nmasa\nrece\n", encoding="utf-8")
+    dictionary = WordDictionary(str(path))
+    dictionary.remove_words("mare")
+    dictionary.save_xml()
+    dictionary = WordDictionary(str(path))
+    assert "mare" not in dictionary.words
+    dictionary.add_words("mare")
+    dictionary.save_xml()
+    dictionary = WordDictionary(str(path))
+    assert "mare" in dictionary.words
+    dictionary.compact_xml()
+    assert WordDictionary(str(path)).words == {"mare", "masa", "rece"}
+    assert "__mare" not in path.read_text(encoding="utf-8")
+    assert path.read_text(encoding="utf-8").count("mare") == 1
+
+
+def test_added_word_is_normalized(tmp_path):
+    path = tmp_path / "dex.xml"
+    write_xml(path, DEX_DESCRIPTIONS)
+    dictionary = WordDictionary(str(path))
+    dictionary.add_words("mașină")
+    dictionary.save_xml()
+    dictionary = WordDictionary(str(path))
+    assert "masina" in dictionary.words
+    dictionary.compact_xml()
+    assert "mașină (added by fazan)" in path.read_text(encoding="utf-8")
+    assert "masina" in WordDictionary(str(path)).words
+
+
+def test_queued_saves_are_coalesced(tmp_path):
+    path = tmp_path / "dex.xml"
+    write_xml(path, DEX_DESCRIPTIONS)
+    dictionary = WordDictionary(str(path))
+    sink = MemoryMetrics()
+    metrics.set_metrics(sink)
+    # Keep the writer busy while the changes are saved
+    release = threading.Event()
+    word_dictionary._journal_writer.submit(release.wait)
+    try:
+        dictionary.add_words("cartof")
+        dictionary.save_xml()
+        dictionary.remove_words("acadea")
+        dictionary.save_xml()
+        assert not (tmp_path / "dex.xml.journal").exists()
+    finally:
+        release.set()
+        dictionary.flush()
+        metrics.set_metrics(None)
+    assert sink.timers[("save_xml", ())].count == 1
+    lines = (tmp_path / "dex.xml.journal").read_text(
+        encoding="utf-8").splitlines()
+    assert lines[0].startswith("add\tcartof\t")
+    assert lines[1:] == ["remove\tacadea"]
+
+
+def test_failed_compaction_keeps_xml(tmp_path, monkeypatch):
+    path = tmp_path / "dex.xml"
+    write_xml(path, DEX_DESCRIPTIONS)
+    xml = path.read_text(encoding="utf-8")
+    dictionary = WordDictionary(str(path))
+    dictionary.add_words("zar")
+
+    def fail_write(self, file, *args, **kwargs):
+        file.write(b"<Root>")
+        raise OSError("disk full")
+    monkeypatch.setattr(ET.ElementTree, "write", fail_write)
+    with pytest.raises(OSError):
+        dictionary.compact_xml()
+    assert path.read_text(encoding="utf-8") == xml
+    assert not list(tmp_path.glob("*.tmp"))
+    assert "zar" in WordDictionary(str(path)).words
+
+
+def test_incomplete_journal_line_is_ignored(tmp_path):
+    path = tmp_path / "dex.xml"
+    write_xml(path, DEX_DESCRIPTIONS)
+    (tmp_path / "dex.xml.journal").write_text(
+        "remove\tcabina\nremove\tca", encoding="utf-8")
+    dictionary = WordDictionary(str(path))
+    assert "cabina" not in dictionary.words
+    assert "cal" in dictionary.words
+
+
+@pytest.mark.parametrize("torn", ["remove\tca", "rem", "x" * 5000])
+def test_change_after_torn_line_is_kept(tmp_path, monkeypatch, torn: str):
+    monkeypatch.setattr("classes.word_dictionary.JOURNAL_READ_SIZE", 16)
+    path = tmp_path / "dex.xml"
+    write_xml(path, DEX_DESCRIPTIONS)
+    journal = tmp_path / "dex.xml.journal"
+    journal.write_text("remove\tcabina\n" + torn, encoding="utf-8")
+    dictionary = WordDictionary(str(path))
+    dictionary.remove_words("abac")
+    dictionary.save_xml()
+    dictionary.flush()
+    assert journal.read_text(encoding="utf-8") == (
+        "remove\tcabina\nremove\tabac\n")
+    reloaded = WordDictionary(str(path))
+    assert "abac" not in reloaded.words
+    assert "cabina" not in reloaded.words
+
+
+def test_endgame_words_follow_removed_words(tmp_path):
+    path = tmp_path / "dex.xml"
+    write_xml(path, ("mare", "masă", "rece", "sare", "casa", "maca"))
+    dictionary = WordDictionary(str(path))
+    assert "maca" not in dictionary.endgame_words
+    dictionary.remove_words("casa")
+    # No word starts with 'ca' anymore
+    assert "maca" in dictionary.endgame_words
+    for word in ("rece", "sare", "mare"):
+        dictionary.remove_words(word)
+        assert dictionary.endgame_words == {
+            word for word in dictionary.words
+            if not any(other.startswith(word[-2:])
+                       for other in dictionary.words)}
+
+
+def test_trie_backend_matches_store_backend(tmp_path):
+    path = tmp_path / "dex.xml"
+    write_xml(path, DEX_DESCRIPTIONS + ("abacus", "calar", "lac"))
+    store = WordDictionary(str(path), use_cache=False)
+    trie = WordDictionary(str(path), backend="trie")
+    for dictionary in (store, trie):
+        dictionary.remove_words("cal", "abac")
+    assert trie.words == store.words
+    assert trie.endgame_words == store.endgame_words
+    for word_start in ("a", "ab", "aba", "ca", "cal", "x"):
+        assert trie.prefix_words(word_start) == store.prefix_words(
+            word_start)
+    # The compiled dictionary of the other backend isn't loaded
+    assert WordDictionary(str(path)).backend == "store"
+    with pytest.raises(ValueError):
+        WordDictionary(str(path), backend="dawg")
+
+
+def test_compiled_dictionary_follows_language(tmp_path):
+    path = tmp_path / "words.txt"
+    path.write_text("mare\nmasă\n", encoding="utf-8")
+    assert WordDictionary(str(path), language=ENGLISH).words == {"mare"}
+    assert WordDictionary(str(path), language=ROMANIAN).words == {
+        "mare", "masa"}
+
+
+def test_compiled_dictionary_follows_language_rules(tmp_path):
+    path = tmp_path / "dex.xml"
+    write_xml(path, ("rac", "rece", "mare"))
+    assert "rac" in WordDictionary(str(path)).words
+    strict = Language("romanian", replacements=DIACRITICS,
+                      annotation_pattern=ANNOTATION_PATTERN,
+                      variation_separator=VARIATION_SEPARATOR,
+                      min_word_length=4)
+    assert WordDictionary(str(path), language=strict).words == {
+        "rece", "mare"}
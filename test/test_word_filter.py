@@ -0,0 +1,52 @@
+import pytest
+
+from classes.word_filter import (ENGLISH, Language, filter_descriptions,
+                                 filter_words)
+
+
+@pytest.mark.parametrize(
+    "description, words",
+    [
+        ("abac", ["abac"]),
+        ("abator (ind.)", ["abator"]),
+        ("acar / acadea", ["acar", "acadea"]),
+        ("bază (s.f.) / băză", ["baza", "baza"]),
+        ("țânțar", ["tantar"]),
+        ("Bacău", []),
+        ("ox", []),
+        ("auto-stop", []),
+        ("café", []),
+        ("", []),
+    ]
+)
+def test_filter_description(description: str, words: list[str]):
+    assert filter_descriptions([description]) == [words]
+
+
+def test_filter_batch_keeps_descriptions_apart():
+    descriptions = ["cal (s.\n", "masă) / mare", "bine\nrău", "rece"]
+    assert filter_descriptions(descriptions) == [[], ["mare"], [], ["rece"]]
+    assert filter_words(descriptions) == ["mare", "rece"]
+
+
+def test_language_rules():
+    language = Language("italian", alphabet="abcdefghilmnopqrstuvz",
+                        replacements={"à": "a", "è": "e"},
+                        min_word_length=2)
+    assert language.normalize("città (s.f.)") == "citta (s.f.)"
+    assert language.filter_descriptions(
+        ["città", "è", "jazz", "Roma", "re / ra"]) == [
+        ["citta"], [], [], [], []]
+    assert ENGLISH.filter_descriptions(["cat", "Dog", "ox", "café"]) == [
+        ["cat"], [], [], []]
+
+
+def test_language_alphabet_uses_game_letters():
+    with pytest.raises(ValueError):
+        Language("russian", alphabet="абв")
+
+
+@pytest.mark.parametrize("min_word_length", [0, 1])
+def test_language_words_have_bigrams(min_word_length: int):
+    with pytest.raises(ValueError):
+        Language("letters", min_word_length=min_word_length)
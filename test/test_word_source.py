@@ -0,0 +1,109 @@
+import gzip
+import os
+import threading
+
+import pytest
+
+from classes.word_dictionary import WordDictionary
+from classes.word_filter import ENGLISH
+from classes.word_source import (TextSource, XmlSource, word_source,
+                                 write_atomic)
+from test.conftest import write_xml
+
+WORDS = ("cat", "Dog", "mouse (pl. mice)", "", "horse")
+
+
+def write_list(path, words) -> None:
+    text = "".join(word + "\n" for word in words)
+    if str(path).endswith(".gz"):
+        with gzip.open(path, "wt", encoding="utf-8") as file:
+            file.write(text)
+    else:
+        path.write_text(text, encoding="utf-8")
+
+
+def read_list(path) -> list[str]:
+    if str(path).endswith(".gz"):
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            return file.read().splitlines()
+    return path.read_text(encoding="utf-8").splitlines()
+
+
+@pytest.mark.parametrize(
+    "name, source_type",
+    [
+        ("dex.xml", XmlSource),
+        ("words.txt", TextSource),
+        ("words.txt.gz", TextSource),
+    ]
+)
+def test_source_by_extension(name: str, source_type: type):
+    source = word_source(name)
+    assert isinstance(source, source_type)
+    assert source.path == name
+
+
+def test_xml_entries(tmp_path):
+    path = tmp_path / "dex.xml"
+    write_xml(path, ("abac", "acar / acadea"))
+    assert list(XmlSource(str(path)).entries()) == [
+        (1, "abac"), (2, "acar / acadea")]
+
+
+@pytest.mark.parametrize("name", ["words.txt", "words.txt.gz"])
+def test_text_entries(tmp_path, name: str):
+    path = tmp_path / name
+    write_list(path, WORDS)
+    assert list(TextSource(str(path)).entries()) == list(
+        enumerate(WORDS, start=1))
+
+
+@pytest.mark.parametrize("name", ["words.txt", "words.txt.gz"])
+def test_text_rewrite(tmp_path, name: str):
+    path = tmp_path / name
+    write_list(path, WORDS)
+    TextSource(str(path)).rewrite(["zebra"], {"cat", "horse"}, ENGLISH)
+    assert read_list(path) == ["Dog", "mouse (pl. mice)", "", "zebra"]
+    assert [file.name for file in tmp_path.iterdir()] == [name]
+
+
+@pytest.mark.parametrize("name", ["words.txt", "words.txt.gz"])
+def test_word_list_dictionary(tmp_path, name: str):
+    path = tmp_path / name
+    write_list(path, ("zebra", "bravo", "Oslo", "vodka", "kayak", "ox"))
+    dictionary = WordDictionary(str(path), language=ENGLISH)
+    assert dictionary.words == {"zebra", "bravo", "vodka", "kayak"}
+    # 'ra' and 'ak' don't start any word
+    assert dictionary.endgame_words == {"zebra", "kayak"}
+    dictionary.add_words("akita")
+    dictionary.remove_words("zebra")
+    dictionary.compact_xml()
+    assert read_list(path) == ["bravo", "Oslo", "vodka", "kayak", "ox",
+                               "akita"]
+    reloaded = WordDictionary(str(path), language=ENGLISH)
+    assert reloaded.words == {"bravo", "vodka", "kayak", "akita"}
+
+
+def test_concurrent_atomic_writes(tmp_path):
+    path = tmp_path / "dex.xml.cache"
+    path.write_bytes(b"old")
+    os.chmod(path, 0o640)
+    # Both writers are inside 'write' at the same time
+    barrier = threading.Barrier(2)
+
+    def write(data: bytes) -> None:
+        def write_data(file) -> None:
+            file.write(data[:1])
+            barrier.wait(5)
+            file.write(data[1:])
+        write_atomic(str(path), write_data)
+
+    threads = [threading.Thread(target=write, args=(data,))
+               for data in (b"first", b"second")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert path.read_bytes() in (b"first", b"second")
+    assert os.stat(path).st_mode & 0o777 == 0o640
+    assert [file.name for file in tmp_path.iterdir()] == ["dex.xml.cache"]
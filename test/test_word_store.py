@@ -0,0 +1,57 @@
+import pytest
+
+from classes.word_store import (BIGRAMS, WordStore, bigram_id, bigram_text,
+                                get_bit, new_bitset, set_bit)
+
+WORDS = ("mare", "masa", "rece", "sare", "casa", "maca", "cal", "abac")
+
+
+@pytest.fixture
+def store() -> WordStore:
+    return WordStore(WORDS)
+
+
+@pytest.mark.parametrize(
+    "bigram, expected",
+    [("aa", 0), ("ab", 1), ("ba", 26), ("zz", BIGRAMS - 1),
+     ("a", -1), ("aă", -1), ("Ab", -1)]
+)
+def test_bigram_id(bigram: str, expected: int):
+    assert bigram_id(bigram) == expected
+    if expected >= 0:
+        assert bigram_text(expected) == bigram
+
+
+def test_bitset():
+    bitset = new_bitset(20)
+    assert len(bitset) == 3
+    set_bit(bitset, 9)
+    assert get_bit(bitset, 9)
+    assert not any(get_bit(bitset, index)
+                   for index in range(20) if index != 9)
+
+
+def test_words_are_sorted_by_id(store: WordStore):
+    assert list(store) == sorted(WORDS)
+    assert all(store[store.word_id(word)] == word for word in WORDS)
+    assert store.word_id("mar") == -1
+    assert store.word_id("zebra") == -1
+    assert "masa" in store
+
+
+@pytest.mark.parametrize(
+    "word_start, expected",
+    [("m", {"mare", "masa", "maca"}), ("ma", {"mare", "masa", "maca"}),
+     ("mar", {"mare"}), ("ca", {"casa", "cal"}), ("z", set()),
+     ("ș", set()), ("marea", set())]
+)
+def test_prefix_ids(store: WordStore, word_start: str, expected: set[str]):
+    assert {store[word_id]
+            for word_id in store.prefix_ids(word_start)} == expected
+
+
+def test_bigrams(store: WordStore):
+    assert all(bigram_text(store.starts[word_id]) == store[word_id][:2]
+               for word_id in range(len(store)))
+    assert all(bigram_text(store.ends[word_id]) == store[word_id][-2:]
+               for word_id in range(len(store)))
@@ -0,0 +1,37 @@
+import pytest
+
+from classes.word_store import WordStore
+from classes.word_trie import WordTrie
+from test.test_word_store import WORDS
+
+MORE_WORDS = WORDS + ("ma", "mar", "marea", "mareea", "abacus", "zz")
+
+
+@pytest.fixture
+def trie() -> WordTrie:
+    return WordTrie(MORE_WORDS)
+
+
+def test_trie_matches_store(trie: WordTrie):
+    store = WordStore(MORE_WORDS)
+    assert list(trie) == list(store)
+    assert list(trie.starts) == list(store.starts)
+    assert list(trie.ends) == list(store.ends)
+    for word in MORE_WORDS + ("m", "mareee", "x", "ș"):
+        assert trie.word_id(word) == store.word_id(word)
+        assert trie.prefix_ids(word) == store.prefix_ids(word)
+
+
+def test_live_counts(trie: WordTrie):
+    store = WordStore(MORE_WORDS)
+    trie.discard(trie.word_id("mare"))
+    played = {}
+    for node in trie.path(trie.word_id("marea")):
+        played[node] = played.get(node, 0) + 1
+    for word_start in ("", "m", "ma", "mar", "mare", "marea", "x"):
+        live = [word_id for word_id in store.prefix_ids(word_start)
+                if store[word_id] not in ("mare", "marea")]
+        assert trie.live_count(word_start, played) == len(live)
+        assert [trie.sample_id(word_start, index, played)
+                for index in range(len(live))] == live
+    assert trie.live_count("mare") == 2